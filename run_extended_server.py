@@ -51,7 +51,7 @@ def main():
     # Import the server extension
     try:
         from src.unreal_blender_mcp.blender_addon_server import ServerExtensionManager
-        from src.unreal_blender_mcp.blender_addon_server import run_extended_server
+        from src.unreal_blender_mcp.blender_addon_server import run_extended_server, run_in_event_loop
     except ImportError as e:
         logger.error(f"Failed to import server extension: {e}")
         logger.error("Make sure you're running this script from the project root directory")
@@ -83,8 +83,8 @@ def main():
     logger.info(f"Starting extended BlenderMCP server on {args.host}:{args.port}")
     
     try:
-        # Run the server
-        run_extended_server(host=args.host, port=args.port)
+        # Run the server (on uvloop when installed)
+        run_in_event_loop(run_extended_server(host=args.host, port=args.port))
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
     except Exception as e:
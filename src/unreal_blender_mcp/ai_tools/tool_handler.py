@@ -46,7 +46,7 @@ class ToolHandler:
         Returns:
             Result of the tool execution
         """
-        logger.info(f"Handling tool call: {tool_name} with args: {args}")
+        logger.debug("Handling tool call: %s with args: %s", tool_name, args)
         
         # Get tool definition
         tool_def = get_tool_by_name(tool_name)
@@ -103,50 +103,15 @@ class ToolHandler:
         
         # Route to the appropriate Blender method based on tool name
         try:
-            if tool_name == "mcp_blender_get_scene_info":
-                result = self.blender_connection.get_scene_info()
-            elif tool_name == "mcp_blender_get_object_info":
-                result = self.blender_connection.get_object_info(args["object_name"])
-            elif tool_name == "mcp_blender_create_primitive":
-                # Extract required and optional parameters
-                obj_type = args["type"]
-                location = args.get("location")
-                rotation = args.get("rotation")
-                scale = args.get("scale")
-                name = args.get("name")
-                color = args.get("color")
-                
-                # Create the object
-                result = self.blender_connection.create_object(
-                    type=obj_type,
-                    name=name,
-                    location=location,
-                    rotation=rotation,
-                    scale=scale
-                )
-                
-                # Apply color if provided
-                if color and result.get("status") == "success" and name:
-                    self.blender_connection.execute_command("set_material", {
-                        "object_name": name,
-                        "color": color
-                    })
-            elif tool_name == "mcp_blender_create_material":
-                result = self.blender_connection.execute_command("create_material", args)
-            elif tool_name == "mcp_blender_assign_material":
-                result = self.blender_connection.execute_command("assign_material", args)
-            elif tool_name == "mcp_blender_transform_object":
-                result = self.blender_connection.execute_command("transform_object", args)
-            elif tool_name == "mcp_blender_export_model":
-                result = self.blender_connection.execute_command("export_model", args)
-            elif tool_name == "mcp_blender_execute_code":
-                result = self.blender_connection.execute_code(args["code"])
+            handler = self._BLENDER_TOOLS.get(tool_name)
+            if handler is not None:
+                result = handler(self, args)
             else:
                 # For any other commands, pass through to the generic execute_command
                 command_name = tool_name.replace("mcp_blender_", "")
                 result = self.blender_connection.execute_command(command_name, args)
                 
-            logger.info(f"Blender tool {tool_name} executed with result: {result}")
+            logger.debug("Blender tool %s executed with result: %s", tool_name, result)
             return result
         except Exception as e:
             error_msg = f"Error executing Blender tool {tool_name}: {str(e)}"
@@ -175,38 +140,71 @@ class ToolHandler:
         
         # Route to the appropriate Unreal method based on tool name
         try:
-            if tool_name == "mcp_unreal_get_engine_version":
-                result = self.unreal_connection.get_engine_version()
-            elif tool_name == "mcp_unreal_create_level":
-                result = self.unreal_connection.create_level(args["level_name"])
-            elif tool_name == "mcp_unreal_create_actor":
-                result = self.unreal_connection.execute_command("create_actor", args)
-            elif tool_name == "mcp_unreal_import_asset":
-                result = self.unreal_connection.import_asset(
-                    args["file_path"],
-                    args["destination_path"],
-                    args.get("asset_name")
-                )
-            elif tool_name == "mcp_unreal_create_blueprint":
-                result = self.unreal_connection.execute_command("create_blueprint", args)
-            elif tool_name == "mcp_unreal_modify_actor":
-                result = self.unreal_connection.execute_command("modify_actor", args)
-            elif tool_name == "mcp_unreal_set_material":
-                result = self.unreal_connection.execute_command("set_material", args)
-            elif tool_name == "mcp_unreal_execute_code":
-                result = self.unreal_connection.execute_code(args["code"])
+            handler = self._UNREAL_TOOLS.get(tool_name)
+            if handler is not None:
+                result = handler(self, args)
             else:
                 # For any other commands, pass through to the generic execute_command
                 command_name = tool_name.replace("mcp_unreal_", "")
                 result = self.unreal_connection.execute_command(command_name, args)
                 
-            logger.info(f"Unreal tool {tool_name} executed with result: {result}")
+            logger.debug("Unreal tool %s executed with result: %s", tool_name, result)
             return result
         except Exception as e:
             error_msg = f"Error executing Unreal tool {tool_name}: {str(e)}"
             logger.error(error_msg)
             return {"status": "error", "message": error_msg}
     
+    def _create_blender_primitive(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Create a Blender primitive and apply its color, if one was given.
+        
+        Args:
+            args: Arguments of the mcp_blender_create_primitive tool call
+            
+        Returns:
+            Result of the object creation
+        """
+        name = args.get("name")
+        color = args.get("color")
+        
+        # Create the object
+        result = self.blender_connection.create_object(
+            type=args["type"],
+            name=name,
+            location=args.get("location"),
+            rotation=args.get("rotation"),
+            scale=args.get("scale")
+        )
+        
+        # Apply color if provided
+        if color and result.get("status") == "success" and name:
+            self.blender_connection.execute_command("set_material", {
+                "object_name": name,
+                "color": color
+            })
+        return result
+    
+    # Tools that need more than a pass-through to the connection's execute_command.
+    # Any other mcp_blender_*/mcp_unreal_* tool runs the command named by its suffix.
+    _BLENDER_TOOLS = {
+        "mcp_blender_get_scene_info": lambda self, args: self.blender_connection.get_scene_info(),
+        "mcp_blender_get_object_info": lambda self, args: self.blender_connection.get_object_info(args["object_name"]),
+        "mcp_blender_create_primitive": _create_blender_primitive,
+        "mcp_blender_execute_code": lambda self, args: self.blender_connection.execute_code(args["code"]),
+    }
+    
+    _UNREAL_TOOLS = {
+        "mcp_unreal_get_engine_version": lambda self, args: self.unreal_connection.get_engine_version(),
+        "mcp_unreal_create_level": lambda self, args: self.unreal_connection.create_level(args["level_name"]),
+        "mcp_unreal_import_asset": lambda self, args: self.unreal_connection.import_asset(
+            args["file_path"],
+            args["destination_path"],
+            args.get("asset_name")
+        ),
+        "mcp_unreal_execute_code": lambda self, args: self.unreal_connection.execute_code(args["code"]),
+    }
+    
     def list_available_tools(self) -> List[Dict[str, Any]]:
         """
         Get a list of all available tools.
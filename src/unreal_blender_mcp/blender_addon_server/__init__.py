@@ -5,11 +5,13 @@ This module extends the original BlenderMCP server to provide additional
 functionality while maintaining compatibility with upstream updates.
 """
 
-from .extended_server import ExtendedBlenderMCPServer, run_extended_server
-from .interface import ServerExtensionManager
+from .extended_server import ExtendedBlenderMCPServer, run_extended_server, run_in_event_loop
+from .interface import ServerExtensionManager, ServerExtensionPool
 
 __all__ = [
     'ExtendedBlenderMCPServer',
     'run_extended_server',
-    'ServerExtensionManager'
+    'run_in_event_loop',
+    'ServerExtensionManager',
+    'ServerExtensionPool'
 ] 
\ No newline at end of file
@@ -6,16 +6,24 @@ additional functionality while maintaining compatibility with upstream updates.
 """
 
 import sys
-import os
 import importlib.util
+import functools
 import logging
+from pathlib import Path
 from typing import Dict, Any, Optional, Union, List, AsyncIterator
-import json
+import orjson
 import asyncio
 import time
+import socket
+import threading
 from fastapi import FastAPI
 import uvicorn
 
+try:
+    import uvloop
+except ImportError:  # uvloop is unavailable on Windows
+    uvloop = None
+
 # Set up logger
 logger = logging.getLogger("ExtendedBlenderMCPServer")
 
@@ -71,131 +79,121 @@ class DummyBlenderConnection:
             "dummy": True
         }
 
-# blender-mcp 모듈과 클래스들을 저장할 변수
-mcp = None
-BlenderConnection = None
-get_blender_connection = None
-server_module = None
+# 프로젝트 루트 옆의 blender-mcp 체크아웃 (src/unreal_blender_mcp/blender_addon_server 기준 3단계 위)
+BLENDER_MCP_PATH = Path(__file__).resolve().parents[3] / 'blender-mcp'
 
-# blender-mcp 모듈을 찾는 향상된 방법
-try:
-    # 1. 직접 import 시도
-    try:
-        from blender_mcp.server import mcp, BlenderConnection, get_blender_connection
-        logger.info("Successfully imported blender_mcp directly")
-    except ImportError:
-        logger.info("Direct import failed, trying alternative methods")
-        
-        # 2. 프로젝트 경로에서 blender-mcp 찾기
-        possible_paths = []
+class DummyMCP:
+    """blender_mcp를 불러올 수 없을 때 사용하는 더미 mcp 객체"""
+    def tool(self):
+        def decorator(func):
+            return func
+        return decorator
         
-        # 현재 파일 기준 상대 경로
-        current_dir = os.path.dirname(os.path.realpath(__file__))
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))  # 프로젝트 루트 추정
+    async def start(self, host, port):
+        logger.warning(f"Dummy MCP server start called on {host}:{port}")
+
+def _candidate_paths() -> List[Optional[Path]]:
+    """blender-mcp가 있을 수 있는 경로들 (None은 importlib.util.find_spec으로 찾기)"""
+    possible_paths: List[Optional[Path]] = [
+        # 프로젝트 루트 옆에 있는 경우
+        BLENDER_MCP_PATH,
+        # 기존 방식 (src 디렉토리 안)
+        BLENDER_MCP_PATH.parent / 'src' / 'blender-mcp',
+        # 시스템 파이썬 경로에 설치된 경우
+        None,
+    ]
+    
+    # 설치된 파이썬 패키지에서 찾기
+    try:
+        import site
+        for site_dir in site.getsitepackages():
+            possible_paths.append(Path(site_dir) / 'blender-mcp')
+            possible_paths.append(Path(site_dir) / 'blender_mcp')
+    except Exception as e:
+        logger.warning(f"Error getting site-packages: {str(e)}")
+    
+    # venv/virtualenv 환경 확인
+    if hasattr(sys, 'real_prefix') or (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix):
+        venv_site_packages = Path(sys.prefix) / 'lib' / f'python{sys.version_info.major}.{sys.version_info.minor}' / 'site-packages'
+        possible_paths.append(venv_site_packages / 'blender-mcp')
+        possible_paths.append(venv_site_packages / 'blender_mcp')
+    
+    return possible_paths
+
+def _find_server_path() -> Optional[str]:
+    """blender_mcp/server.py 위치를 찾고, 필요하면 sys.path에 추가"""
+    for path in _candidate_paths():
+        if path is None:
+            # importlib로 모듈 찾기
+            try:
+                spec = importlib.util.find_spec('blender_mcp.server')
+                if spec and spec.origin:
+                    logger.info(f"Found blender_mcp.server via importlib: {spec.origin}")
+                    return spec.origin
+            except Exception as e:
+                logger.debug(f"Error finding spec: {str(e)}")
+            continue
+            
+        if not path.exists():
+            continue
+            
+        # src 디렉토리 찾기 (src가 없는 경우 경로 자체)
+        src_path = path / 'src'
+        if not src_path.exists():
+            src_path = path
+            
+        # server.py 찾기
+        server_path = src_path / 'blender_mcp' / 'server.py'
+        if server_path.exists():
+            logger.info(f"Found server.py at: {server_path}")
+            
+            # 모듈 import를 위해 경로 추가
+            for entry in {str(path), str(src_path)}.difference(sys.path):
+                sys.path.append(entry)
+            return str(server_path)
+    return None
+
+@functools.lru_cache(maxsize=1)
+def _load_upstream():
+    """
+    blender-mcp 모듈을 찾아 (mcp, BlenderConnection, get_blender_connection)을 반환.
+    
+    경로 탐색과 모듈 로드는 한 번만 수행하고 결과를 재사용한다. 불러올 수 없으면
+    더미 구현을 반환한다 (BlenderConnection 자리에는 DummyBlenderConnection).
+    """
+    try:
+        # 1. 직접 import 시도
+        try:
+            from blender_mcp.server import mcp, BlenderConnection, get_blender_connection
+            logger.info("Successfully imported blender_mcp directly")
+            return mcp, BlenderConnection, get_blender_connection
+        except ImportError:
+            logger.info("Direct import failed, trying alternative methods")
         
-        # 가능한 경로들
-        possible_paths.extend([
-            # 기존 방식
-            os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'blender-mcp'),
-            # 프로젝트 루트 옆에 있는 경우
-            os.path.join(base_dir, 'blender-mcp'),
-            # 형제 디렉토리로 있는 경우
-            os.path.join(os.path.dirname(os.path.dirname(current_dir)), 'blender-mcp'),
-            # 시스템 파이썬 경로에 설치된 경우
-            None  # importlib.util.find_spec('blender_mcp')으로 찾음
-        ])
+        # 2. 프로젝트 경로 등에서 blender-mcp 찾기
+        server_path = _find_server_path()
+        if not server_path:
+            raise ImportError("Could not find blender_mcp.server module in any location")
         
-        # 설치된 파이썬 패키지에서 찾기
+        # 찾은 서버 모듈 로드
         try:
-            import site
-            site_packages = site.getsitepackages()
-            for site_dir in site_packages:
-                possible_paths.append(os.path.join(site_dir, 'blender-mcp'))
-                possible_paths.append(os.path.join(site_dir, 'blender_mcp'))
+            spec = importlib.util.spec_from_file_location("blender_mcp.server", server_path)
+            server_module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(server_module)
+            logger.info("Successfully loaded BlenderMCP server module")
+            return server_module.mcp, server_module.BlenderConnection, server_module.get_blender_connection
         except Exception as e:
-            logger.warning(f"Error getting site-packages: {str(e)}")
+            logger.error(f"Error loading server module from {server_path}: {str(e)}")
+            raise
+    except Exception as e:
+        logger.error(f"Failed to import blender_mcp: {str(e)}")
         
-        # venv/virtualenv 환경 확인
-        if hasattr(sys, 'real_prefix') or (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix):
-            try:
-                venv_site_packages = os.path.join(sys.prefix, 'lib', f'python{sys.version_info.major}.{sys.version_info.minor}', 'site-packages')
-                possible_paths.append(os.path.join(venv_site_packages, 'blender-mcp'))
-                possible_paths.append(os.path.join(venv_site_packages, 'blender_mcp'))
-            except Exception as e:
-                logger.warning(f"Error getting venv site-packages: {str(e)}")
+        def get_blender_connection():
+            return DummyBlenderConnection()
         
-        # 각 경로 시도
-        server_path = None
-        for path in possible_paths:
-            if path is None:
-                # importlib로 모듈 찾기
-                try:
-                    spec = importlib.util.find_spec('blender_mcp.server')
-                    if spec and spec.origin:
-                        server_path = spec.origin
-                        logger.info(f"Found blender_mcp.server via importlib: {server_path}")
-                        break
-                except Exception as e:
-                    logger.debug(f"Error finding spec: {str(e)}")
-                continue
-                
-            if not os.path.exists(path):
-                continue
-                
-            # src 디렉토리 찾기
-            src_path = os.path.join(path, 'src')
-            if not os.path.exists(src_path):
-                src_path = path  # src가 없는 경우
-                
-            # server.py 찾기
-            potential_server_path = os.path.join(src_path, 'blender_mcp', 'server.py')
-            if os.path.exists(potential_server_path):
-                server_path = potential_server_path
-                logger.info(f"Found server.py at: {server_path}")
-                
-                # 모듈 import를 위해 경로 추가
-                if path not in sys.path:
-                    sys.path.append(path)
-                if src_path not in sys.path:
-                    sys.path.append(src_path)
-                    
-                break
-        
-        # 찾은 서버 모듈 로드
-        if server_path:
-            try:
-                spec = importlib.util.spec_from_file_location("blender_mcp.server", server_path)
-                server_module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(server_module)
-                
-                # 필요한 클래스와 함수 참조
-                mcp = server_module.mcp
-                BlenderConnection = server_module.BlenderConnection
-                get_blender_connection = server_module.get_blender_connection
-                logger.info("Successfully loaded BlenderMCP server module")
-            except Exception as e:
-                logger.error(f"Error loading server module from {server_path}: {str(e)}")
-                raise
-        else:
-            raise ImportError("Could not find blender_mcp.server module in any location")
-            
-except Exception as e:
-    logger.error(f"Failed to import blender_mcp: {str(e)}")
-    
-    # 더미 mcp 객체
-    class DummyMCP:
-        def tool(self):
-            def decorator(func):
-                return func
-            return decorator
-            
-        async def start(self, host, port):
-            logger.warning(f"Dummy MCP server start called on {host}:{port}")
-    
-    mcp = DummyMCP()
-    
-    def get_blender_connection():
-        return DummyBlenderConnection()
+        return DummyMCP(), DummyBlenderConnection, get_blender_connection
+
+mcp, BlenderConnection, get_blender_connection = _load_upstream()
 
 # Custom extended connection class that inherits from original
 class ExtendedBlenderConnection(BlenderConnection):
@@ -211,6 +209,12 @@ class ExtendedBlenderConnection(BlenderConnection):
         """
         super().__init__(host, port)
         self.extended_features_enabled = False
+        # get_version_info reply from connect(); the addon version can't change mid-session
+        self.extended_version_info: Optional[Dict[str, Any]] = None
+        # The addon speaks one request/response at a time over a single socket, so
+        # commands from concurrent threads must not interleave. Re-entrant because
+        # the upstream send_command may reconnect, and connect() sends commands.
+        self._command_lock = threading.RLock()
     
     def connect(self) -> bool:
         """Connect and check for extended features support"""
@@ -221,6 +225,7 @@ class ExtendedBlenderConnection(BlenderConnection):
         for retry in range(max_retries):
             try:
                 if super().connect():
+                    self._enable_keepalive()
                     # 연결 성공 후 확장 기능 지원 확인
                     try:
                         # 먼저 기본 명령으로 테스트
@@ -232,6 +237,7 @@ class ExtendedBlenderConnection(BlenderConnection):
                             logger.info(f"Testing extended features with get_version_info command")
                             result = self.send_command("get_version_info", {})
                             self.extended_features_enabled = "extended_version" in result
+                            self.extended_version_info = result if self.extended_features_enabled else None
                         except Exception as e:
                             # 확장 명령이 실패하면 기본 기능만 지원하는 것으로 간주
                             logger.info(f"Extended feature check failed: {str(e)}")
@@ -260,11 +266,59 @@ class ExtendedBlenderConnection(BlenderConnection):
         
         return False
     
+    def _enable_keepalive(self):
+        """Turn on TCP keepalive so a dead Blender peer is noticed without app-level pings"""
+        sock = getattr(self, "sock", None)
+        if sock is None:
+            return
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            if hasattr(socket, "TCP_KEEPIDLE"):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3)
+        except OSError as e:
+            logger.debug(f"Could not enable TCP keepalive: {str(e)}")
+    
+    @staticmethod
+    def _is_connection_lost(error: Exception) -> bool:
+        """Whether a send_command failure came from a dropped socket (not e.g. a timeout)"""
+        # Upstream re-raises socket errors as a plain Exception, keeping the original as context
+        return isinstance(error, ConnectionError) or isinstance(error.__context__, ConnectionError)
+    
+    def send_command(self, command_type: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Send a command, serialized with any other command on this connection.
+        
+        If a previously open socket turns out to be dead, reconnect and retry once.
+        """
+        with self._command_lock:
+            had_socket = getattr(self, "sock", None) is not None
+            try:
+                return super().send_command(command_type, params)
+            except Exception as e:
+                if not had_socket or not self._is_connection_lost(e):
+                    raise
+                logger.warning(f"Blender connection lost ({str(e)}), reconnecting and retrying {command_type}")
+                self.sock = None
+                if not super().connect():
+                    raise
+                self._enable_keepalive()
+                return super().send_command(command_type, params)
+    
     def send_extended_command(self, command_type: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
         """Send a command that's only available in the extended addon"""
         if not self.extended_features_enabled:
             raise Exception("Extended features not available in connected Blender addon")
         return self.send_command(command_type, params)
+    
+    async def send_command_async(self, command_type: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Send a command from a worker thread so the event loop is not blocked"""
+        return await asyncio.to_thread(self.send_command, command_type, params)
+    
+    async def send_extended_command_async(self, command_type: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Async variant of send_extended_command"""
+        return await asyncio.to_thread(self.send_extended_command, command_type, params)
 
 # Create global extended connection variable
 _extended_blender_connection = None
@@ -273,22 +327,10 @@ def get_extended_blender_connection():
     """Get or create a persistent extended Blender connection"""
     global _extended_blender_connection
     
-    # If we have an existing connection, check if it's still valid
+    # Reuse the existing connection; a dead socket is detected on the next real
+    # command, which reconnects and retries (see ExtendedBlenderConnection.send_command)
     if _extended_blender_connection is not None:
-        try:
-            # Test the connection with a simple command
-            result = _extended_blender_connection.send_command("get_scene_info")
-            logger.info("Reusing existing Blender connection")
-            return _extended_blender_connection
-        except Exception as e:
-            # Connection is dead, close it and create a new one
-            logger.warning(f"Existing extended connection is no longer valid: {str(e)}")
-            try:
-                _extended_blender_connection.disconnect()
-            except Exception as sub_e:
-                logger.warning(f"Error while disconnecting: {str(sub_e)}")
-            finally:
-                _extended_blender_connection = None
+        return _extended_blender_connection
     
     # Create a new connection if needed
     if _extended_blender_connection is None:
@@ -319,38 +361,55 @@ def get_extended_blender_connection():
     
     return _extended_blender_connection
 
+def close_extended_blender_connection():
+    """Disconnect and forget the persistent extended Blender connection, if any"""
+    global _extended_blender_connection
+    
+    if _extended_blender_connection is None:
+        return
+    try:
+        _extended_blender_connection.disconnect()
+    except Exception as e:
+        logger.warning(f"Error while disconnecting: {str(e)}")
+    finally:
+        _extended_blender_connection = None
+
+def _to_json(obj: Any) -> str:
+    """Serialize a tool result as indented JSON text."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2, default=str).decode()
+
 # Define additional tools using the original MCP server as a base
 @mcp.tool()
-def extended_scene_info(ctx) -> str:
+async def extended_scene_info(ctx) -> str:
     """
     Get enhanced scene information with additional details not available in the standard addon.
     This tool uses the extended Blender addon functionality if available.
     """
     try:
-        blender = get_extended_blender_connection()
+        blender = await asyncio.to_thread(get_extended_blender_connection)
         
         # If extended features are available, use them
         if blender.extended_features_enabled:
-            result = blender.send_extended_command("get_version_info", {})
+            version_info = blender.extended_version_info or {}
             extended_info = {
                 "extended_info_available": True,
-                "extended_version": result.get("extended_version", "unknown"),
-                "scene_info": blender.send_command("get_scene_info")
+                "extended_version": version_info.get("extended_version", "unknown"),
+                "scene_info": await blender.send_command_async("get_scene_info")
             }
-            return json.dumps(extended_info, indent=2)
+            return _to_json(extended_info)
         else:
             # Fall back to standard scene info
-            result = blender.send_command("get_scene_info")
-            return json.dumps({
+            result = await blender.send_command_async("get_scene_info")
+            return _to_json({
                 "extended_info_available": False,
                 "scene_info": result
-            }, indent=2)
+            })
     except Exception as e:
         logger.error(f"Error getting extended scene info: {str(e)}")
         return f"Error getting extended scene info: {str(e)}"
 
 @mcp.tool()
-def extended_command_example(ctx, param1: str = "", param2: int = 0) -> str:
+async def extended_command_example(ctx, param1: str = "", param2: int = 0) -> str:
     """
     Example of a tool that uses the extended Blender addon's custom commands.
     This tool will only work if the Blender addon has the extended functionality.
@@ -360,19 +419,19 @@ def extended_command_example(ctx, param1: str = "", param2: int = 0) -> str:
     - param2: An integer parameter
     """
     try:
-        blender = get_extended_blender_connection()
+        blender = await asyncio.to_thread(get_extended_blender_connection)
         
         # Check if extended features are available
         if not blender.extended_features_enabled:
             return "This tool requires the extended Blender addon. Please install and enable it."
         
         # Call the extended command
-        result = blender.send_extended_command("extended_command_example", {
+        result = await blender.send_extended_command_async("extended_command_example", {
             "param1": param1,
             "param2": param2
         })
         
-        return json.dumps(result, indent=2)
+        return _to_json(result)
     except Exception as e:
         logger.error(f"Error executing extended command: {str(e)}")
         return f"Error executing extended command: {str(e)}"
@@ -396,17 +455,32 @@ class ExtendedBlenderMCPServer:
         # This method can be used to dynamically register more tools
         pass
     
-    async def start(self, host: str = "0.0.0.0", port: int = 8400):
-        """Start the extended server."""
-        logger.info(f"Starting extended BlenderMCP server on {host}:{port}")
-        
+    def build_server(self, host: str = "0.0.0.0", port: int = 8400, **config_options) -> uvicorn.Server:
+        """Register additional tools and create (but don't start) the uvicorn server."""
         # Register any additional tools
         self.register_additional_tools()
         
         # Configure the server
-        config = uvicorn.Config(self.app, host=host, port=port)
-        server = uvicorn.Server(config)
-        await server.serve()
+        config = uvicorn.Config(self.app, host=host, port=port, **config_options)
+        return uvicorn.Server(config)
+    
+    async def start(self, host: str = "0.0.0.0", port: int = 8400):
+        """Start the extended server."""
+        logger.info(f"Starting extended BlenderMCP server on {host}:{port}")
+        
+        server = self.build_server(host=host, port=port)
+        try:
+            # uvicorn installs its own SIGINT/SIGTERM handlers and returns from
+            # serve() on shutdown, so connections are released here
+            await server.serve()
+        finally:
+            close_extended_blender_connection()
+
+def run_in_event_loop(coro):
+    """Run a coroutine to completion on uvloop when installed, otherwise on stdlib asyncio."""
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
 
 async def run_extended_server(host: str = "0.0.0.0", port: int = 8400):
     """Run the extended MCP server."""
@@ -423,4 +497,4 @@ async def run_extended_server(host: str = "0.0.0.0", port: int = 8400):
 # Allow direct execution
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
-    run_extended_server() 
\ No newline at end of file
+    run_in_event_loop(run_extended_server()) 
\ No newline at end of file
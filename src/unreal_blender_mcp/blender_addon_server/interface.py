@@ -7,13 +7,133 @@ configuring it, and launching it with various options.
 
 import os
 import sys
+import atexit
 import logging
+import functools
+import multiprocessing
 import subprocess
 import tempfile
-from typing import Dict, Any, Optional, List, Tuple
+import threading
+import time
+import importlib.util
+from importlib import metadata
+from typing import Dict, Any, Optional, List, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Seconds a check_environment result is reused before probing again
+ENVIRONMENT_CHECK_TTL = 60.0
+
+# (import name, display name) of the packages check_environment looks for
+_REQUIRED_PACKAGES = (("fastapi", "FastAPI"), ("uvicorn", "Uvicorn"))
+
+# Temporary startup scripts not deleted yet; removed once their server exits
+_pending_scripts: Set[str] = set()
+_pending_scripts_lock = threading.Lock()
+
+def _remove_script(script_path: str) -> None:
+    """Delete a temporary startup script and stop tracking it."""
+    try:
+        os.unlink(script_path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.debug(f"Could not remove startup script {script_path}: {e}")
+        return
+    with _pending_scripts_lock:
+        _pending_scripts.discard(script_path)
+
+def _cleanup_after(process: subprocess.Popen, script_path: str) -> None:
+    """Wait for a server process to exit, then delete its startup script."""
+    process.wait()
+    _remove_script(script_path)
+
+@atexit.register
+def _remove_pending_scripts() -> None:
+    """Delete any startup scripts still on disk when the interpreter exits."""
+    with _pending_scripts_lock:
+        pending = list(_pending_scripts)
+    for script_path in pending:
+        _remove_script(script_path)
+
+@functools.lru_cache(maxsize=32)
+def _render_startup_script(host: str, port: int, logging_level: str) -> str:
+    """Render the startup script; a pure function of its arguments, so results are cached."""
+    script = f"""
+import os
+import sys
+import logging
+
+# Setup logging
+logging.basicConfig(
+    level=logging.{logging_level},
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+# Add the project root to Python path
+project_root = os.path.abspath(os.path.dirname(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# Import the extended server
+from src.unreal_blender_mcp.blender_addon_server import run_extended_server, run_in_event_loop
+
+# Run the server (on uvloop when installed)
+run_in_event_loop(run_extended_server(host="{host}", port={port}))
+"""
+    return script
+
+@functools.cache
+def _default_base_dir() -> str:
+    """Project root, four levels above this file."""
+    return os.path.abspath(os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+    ))
+
+@functools.cache
+def _server_subdirs(base_dir: str) -> Tuple[str, str, bool, bool]:
+    """
+    Resolve the original and extended server directories under base_dir.
+    
+    Returns:
+        Tuple of (original_dir, extended_dir, original_exists, extended_exists)
+    """
+    original_server_dir = os.path.join(base_dir, "blender-mcp", "src", "blender_mcp")
+    extended_server_dir = os.path.join(base_dir, "src", "unreal_blender_mcp", "server_extension")
+    return (original_server_dir, extended_server_dir,
+            os.path.isdir(original_server_dir), os.path.isdir(extended_server_dir))
+
+class InProcessServerHandle:
+    """
+    Handle for an extended server running on a thread of the current interpreter.
+    """
+    
+    def __init__(self, server, thread: threading.Thread):
+        """
+        Initialize the handle.
+        
+        Args:
+            server: The uvicorn.Server being run
+            thread: The thread running the server
+        """
+        self.server = server
+        self.thread = thread
+    
+    @property
+    def is_running(self) -> bool:
+        """Whether the server thread is still alive."""
+        return self.thread.is_alive()
+    
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """
+        Ask the server to shut down and wait for its thread to finish.
+        
+        Args:
+            timeout: Seconds to wait for the thread; None waits indefinitely
+        """
+        self.server.should_exit = True
+        self.thread.join(timeout)
+
 class ServerExtensionManager:
     """
     Manages the extended BlenderMCP server installation and execution.
@@ -28,19 +148,19 @@ class ServerExtensionManager:
         """
         if base_dir is None:
             # Try to determine the base directory
-            self.base_dir = os.path.abspath(os.path.join(
-                os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-            ))
+            self.base_dir = _default_base_dir()
         else:
             self.base_dir = os.path.abspath(base_dir)
-            
-        self.original_server_dir = os.path.join(self.base_dir, "blender-mcp", "src", "blender_mcp")
-        self.extended_server_dir = os.path.join(self.base_dir, "src", "unreal_blender_mcp", "server_extension")
+        
+        self._env_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        
+        (self.original_server_dir, self.extended_server_dir,
+         original_exists, extended_exists) = _server_subdirs(self.base_dir)
         
         # Verify directories exist
-        if not os.path.isdir(self.original_server_dir):
+        if not original_exists:
             logger.warning(f"Original server directory not found: {self.original_server_dir}")
-        if not os.path.isdir(self.extended_server_dir):
+        if not extended_exists:
             logger.warning(f"Extended server directory not found: {self.extended_server_dir}")
     
     def create_startup_script(self, host: str = "0.0.0.0", port: int = 8000, 
@@ -56,29 +176,7 @@ class ServerExtensionManager:
         Returns:
             String containing Python code to start the server
         """
-        script = f"""
-import os
-import sys
-import logging
-
-# Setup logging
-logging.basicConfig(
-    level=logging.{logging_level},
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-
-# Add the project root to Python path
-project_root = os.path.abspath(os.path.dirname(__file__))
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
-
-# Import the extended server
-from src.unreal_blender_mcp.server_extension import run_extended_server
-
-# Run the server
-run_extended_server(host="{host}", port={port})
-"""
-        return script
+        return _render_startup_script(host, port, logging_level)
     
     def save_startup_script(self, output_path: Optional[str] = None,
                            host: str = "0.0.0.0", port: int = 8000,
@@ -149,21 +247,75 @@ run_extended_server(host="{host}", port={port})
         
         logger.info(f"Started extended server on {host}:{port} (PID: {server_process.pid})")
         
-        # Clean up the temporary script (on Windows, this might fail while the process is running)
-        try:
-            os.unlink(script_path)
-        except:
-            pass
+        # Delete the temporary script once the server exits; on Windows it cannot
+        # be removed while the process still has it open
+        with _pending_scripts_lock:
+            _pending_scripts.add(script_path)
+        threading.Thread(
+            target=_cleanup_after, args=(server_process, script_path),
+            name=f"startup-script-cleanup-{server_process.pid}", daemon=True
+        ).start()
             
         return server_process
     
-    def check_environment(self) -> Dict[str, Any]:
+    def run_server_inprocess(self, host: str = "0.0.0.0", port: int = 8000,
+                             logging_level: str = "INFO") -> InProcessServerHandle:
+        """
+        Start the extended server on a daemon thread of the current interpreter.
+        
+        Avoids the interpreter startup and re-imports of run_server, which is
+        useful for tests and development loops; use run_server for isolation.
+        
+        The tools share this process's extended Blender connection. If none is
+        open yet, the connection the server opens is closed when it stops; one
+        that was already open belongs to its opener and is left alone.
+        
+        Args:
+            host: Host address to bind the server to
+            port: Port number to use
+            logging_level: Logging level (DEBUG, INFO, WARNING, ERROR)
+            
+        Returns:
+            Handle that can stop the running server
+        """
+        from . import extended_server
+        
+        owns_connection = extended_server._extended_blender_connection is None
+        server = extended_server.ExtendedBlenderMCPServer().build_server(
+            host=host,
+            port=port,
+            log_level=logging_level.lower()
+        )
+        
+        def serve():
+            try:
+                server.run()
+            finally:
+                if owns_connection:
+                    extended_server.close_extended_blender_connection()
+        
+        thread = threading.Thread(target=serve, name=f"extended-server-{port}", daemon=True)
+        thread.start()
+        
+        logger.info(f"Started in-process extended server on {host}:{port}")
+        return InProcessServerHandle(server, thread)
+    
+    def check_environment(self, deep: bool = False) -> Dict[str, Any]:
         """
         Check the environment to ensure everything is set up correctly for the extended server.
         
+        Args:
+            deep: Import the extended server instead of only locating it. Deep
+                checks are never served from the cache.
+        
         Returns:
             Dictionary with check results
         """
+        if not deep and self._env_cache is not None:
+            checked_at, cached = self._env_cache
+            if time.monotonic() - checked_at < ENVIRONMENT_CHECK_TTL:
+                return {**cached, "issues": list(cached["issues"])}
+        
         results = {
             "original_server_dir_exists": os.path.isdir(self.original_server_dir),
             "extended_server_dir_exists": os.path.isdir(self.extended_server_dir),
@@ -171,28 +323,158 @@ run_extended_server(host="{host}", port={port})
             "issues": []
         }
         
-        # Check for required modules
-        try:
-            import fastapi
-            results["fastapi_version"] = fastapi.__version__
-        except ImportError:
-            results["issues"].append("FastAPI not installed. Install with: pip install fastapi")
+        # Check for required modules without executing them
+        for package, display_name in _REQUIRED_PACKAGES:
+            if importlib.util.find_spec(package) is None:
+                results["issues"].append(
+                    f"{display_name} not installed. Install with: pip install {package}"
+                )
+                continue
+            try:
+                results[f"{package}_version"] = metadata.version(package)
+            except metadata.PackageNotFoundError:
+                # Importable (e.g. vendored) but without distribution metadata
+                results[f"{package}_version"] = "unknown"
+        
+        # Locate the extended server module; only a deep check actually imports it
+        if deep:
+            try:
+                from .extended_server import ExtendedBlenderMCPServer
+                results["can_import_extended_server"] = True
+            except ImportError as e:
+                results["can_import_extended_server"] = False
+                results["issues"].append(f"Cannot import ExtendedBlenderMCPServer: {str(e)}")
+        elif importlib.util.find_spec(".extended_server", package=__package__) is not None:
+            results["can_import_extended_server"] = True
+        else:
+            results["can_import_extended_server"] = False
+            results["issues"].append("Cannot find the extended server module")
         
+        if not deep:
+            self._env_cache = (time.monotonic(), results)
+        return {**results, "issues": list(results["issues"])}
+
+# Modules a pooled server process has imported before it is asked to serve
+_POOL_PRELOAD_MODULES = ("fastapi", "uvicorn", f"{__package__}.extended_server")
+
+def _preimport() -> None:
+    """Import the heavy server dependencies ahead of time."""
+    import importlib
+    for module in _POOL_PRELOAD_MODULES:
         try:
-            import uvicorn
-            results["uvicorn_version"] = uvicorn.__version__
+            importlib.import_module(module)
         except ImportError:
-            results["issues"].append("Uvicorn not installed. Install with: pip install uvicorn")
+            # Surfaces again, with a proper traceback, when the server starts
+            pass
+
+def _serve_extended_server(host: str, port: int, logging_level: str) -> None:
+    """Entry point of a pooled server process."""
+    logging.basicConfig(
+        level=getattr(logging, logging_level),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    from .extended_server import run_extended_server, run_in_event_loop
+    run_in_event_loop(run_extended_server(host=host, port=port))
+
+def _standby_worker(conn) -> None:
+    """Pre-import the server dependencies, then wait for the arguments to serve with."""
+    _preimport()
+    try:
+        host, port, logging_level = conn.recv()
+    except EOFError:
+        # The pool was closed before this worker was used
+        return
+    finally:
+        conn.close()
+    _serve_extended_server(host, port, logging_level)
+
+class ServerExtensionPool:
+    """
+    Launches extended servers from pre-warmed interpreters.
+    
+    Where the forkserver start method is available (Linux, macOS), every server
+    is forked from a fork server that has already imported FastAPI, uvicorn and
+    the extended server. Elsewhere a spawned standby worker does the imports
+    in advance and is handed its host and port on launch; a new standby is
+    spawned right after.
+    """
+    
+    def __init__(self):
+        """Initialize the pool and start warming it."""
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            self._context = multiprocessing.get_context("forkserver")
+            self._context.set_forkserver_preload(list(_POOL_PRELOAD_MODULES))
+        else:
+            self._context = multiprocessing.get_context("spawn")
+        self._standby: Optional[Tuple[multiprocessing.process.BaseProcess, Any]] = None
+        self._lock = threading.Lock()
+        self.warm()
+    
+    @property
+    def uses_forkserver(self) -> bool:
+        """Whether servers are forked from a preloaded fork server."""
+        return self._context.get_start_method() == "forkserver"
+    
+    def warm(self) -> None:
+        """Start the fork server, or a standby worker, if it is not running yet."""
+        if self.uses_forkserver:
+            from multiprocessing import forkserver
+            forkserver.ensure_running()
+            return
         
-        # Try importing the extended server
-        try:
-            from .extended_server import ExtendedBlenderMCPServer
-            results["can_import_extended_server"] = True
-        except ImportError as e:
-            results["can_import_extended_server"] = False
-            results["issues"].append(f"Cannot import ExtendedBlenderMCPServer: {str(e)}")
+        with self._lock:
+            if self._standby is None or not self._standby[0].is_alive():
+                parent_conn, child_conn = self._context.Pipe()
+                process = self._context.Process(
+                    target=_standby_worker, args=(child_conn,),
+                    name="extended-server-standby", daemon=True
+                )
+                process.start()
+                child_conn.close()
+                self._standby = (process, parent_conn)
+    
+    def run_server(self, host: str = "0.0.0.0", port: int = 8000,
+                   logging_level: str = "INFO") -> multiprocessing.process.BaseProcess:
+        """
+        Start the extended server in a pre-warmed process.
         
-        return results
+        Args:
+            host: Host address to bind the server to
+            port: Port number to use
+            logging_level: Logging level (DEBUG, INFO, WARNING, ERROR)
+            
+        Returns:
+            Process object for the running server
+        """
+        if self.uses_forkserver:
+            process = self._context.Process(
+                target=_serve_extended_server, args=(host, port, logging_level),
+                name=f"extended-server-{port}"
+            )
+            process.start()
+        else:
+            self.warm()
+            with self._lock:
+                process, conn = self._standby
+                self._standby = None
+            conn.send((host, port, logging_level))
+            conn.close()
+            # Keep a warm worker ready for the next launch
+            self.warm()
+        
+        logger.info(f"Started pooled extended server on {host}:{port} (PID: {process.pid})")
+        return process
+    
+    def close(self) -> None:
+        """Stop the idle standby worker, if any."""
+        with self._lock:
+            if self._standby is not None:
+                process, conn = self._standby
+                self._standby = None
+                conn.close()
+                process.join(5)
+                if process.is_alive():
+                    process.terminate()
 
 def main():
     """
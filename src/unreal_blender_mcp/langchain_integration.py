@@ -7,7 +7,8 @@ memory, and document processing capabilities.
 
 import logging
 import os
-from typing import Dict, List, Any, Optional, Union
+import functools
+from typing import Dict, List, Any, Optional, Tuple, Union
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
@@ -59,6 +60,10 @@ class LangchainManager:
         self.memory = {}
         self.document_store = {}
         self.prompt_templates = {}
+        # Rendered prompts keyed by (template_id, template, sorted kwargs). The cache
+        # is per instance, so no module-level cache holds managers; it wraps a bound
+        # method, though, so a dropped manager is freed by the cycle collector
+        self._render_cached = functools.lru_cache(maxsize=512)(self._render)
         self.conversation_memory = ConversationBufferMemory()
         
         # Initialize embeddings if key is provided or in env vars
@@ -89,6 +94,16 @@ class LangchainManager:
         self.memory[key] = value
         logger.info(f"Stored value for key: {key}")
     
+    def store_memories(self, items: List[Tuple[str, Any]]) -> None:
+        """
+        Store several values in memory at once.
+        
+        Args:
+            items: (key, value) pairs to store, applied in order
+        """
+        self.memory.update(items)
+        logger.info(f"Stored {len(items)} values in memory")
+    
     def retrieve_memory(self, key: str) -> Optional[Any]:
         """
         Retrieve a value from memory.
@@ -218,6 +233,7 @@ class LangchainManager:
         try:
             prompt_template = PromptTemplate.from_template(template_text)
             self.prompt_templates[template_id] = prompt_template
+            self._render_cached.cache_clear()
             logger.info(f"Registered prompt template: {template_id}")
         except Exception as e:
             logger.error(f"Failed to register prompt template {template_id}: {e}")
@@ -235,12 +251,27 @@ class LangchainManager:
             The formatted prompt
         """
         if template_id and template_id in self.prompt_templates:
-            return self.prompt_templates[template_id].format(**kwargs)
+            key = (template_id, None)
         elif template:
-            return template.format(**kwargs)
+            key = (None, template)
         else:
             logger.warning(f"Template ID {template_id} not found and no raw template provided")
             return ""
+        
+        items = tuple(sorted(kwargs.items()))
+        try:
+            hash(items)
+        except TypeError:
+            # Unhashable values can't be cached; format them directly
+            return self._render(*key, items)
+        return self._render_cached(*key, items)
+    
+    def _render(self, template_id: Optional[str], template: Optional[str],
+                items: Tuple[Tuple[str, Any], ...]) -> str:
+        """Format a registered template, or else a raw template string, with the given items."""
+        if template_id is not None:
+            return self.prompt_templates[template_id].format(**dict(items))
+        return template.format(**dict(items))
     
     def format_tool_descriptions(self, tools: List[Dict[str, Any]]) -> Dict[str, str]:
         """
@@ -6,18 +6,24 @@ that connects AI agents with Blender and Unreal Engine.
 """
 
 import logging
-import json
-import uuid
+import copy
+import secrets
 import asyncio
-import traceback
-from typing import Dict, List, Any, Optional, AsyncGenerator, Union
+import contextlib
+import itertools
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, AsyncGenerator, Tuple, Union, Callable
 from fastapi import FastAPI, Request, Depends, HTTPException, BackgroundTasks, status
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.responses import StreamingResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.exception_handlers import http_exception_handler
 from fastapi.exceptions import RequestValidationError
 from pydantic import BaseModel, Field, ValidationError
 import time
+import orjson
 from sse_starlette.sse import EventSourceResponse
 
 from .blender_addon_server.extended_server import (
@@ -43,7 +49,79 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Unreal-Blender MCP Server")
+class ORJSONResponse(Response):
+    """JSON response rendered with orjson instead of the stdlib encoder."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        # orjson handles datetime/UUID natively; anything else falls back to str()
+        return orjson.dumps(content, default=str)
+
+class StreamAwareGZipMiddleware:
+    """
+    GZip responses except on streaming paths.
+    
+    GZipMiddleware buffers output until its compressor emits a block, which would
+    hold back SSE events and NDJSON results, so those paths bypass it.
+    """
+    
+    def __init__(self, app, exclude_paths=(), **gzip_options):
+        self.app = app
+        self.gzip_app = GZipMiddleware(app, **gzip_options)
+        self.exclude_paths = frozenset(exclude_paths)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] not in self.exclude_paths:
+            await self.gzip_app(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+class ErrorResponseMiddleware:
+    """
+    Turn unhandled exceptions into the standard 500 error response.
+    
+    A plain ASGI wrapper rather than an Exception handler: Starlette's
+    ServerErrorMiddleware re-raises after running such a handler, so the server
+    logged every failure a second time.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        response_started = False
+        
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            # Too late to replace the response; let the server abort it
+            if response_started:
+                raise
+            logger.error("Unhandled exception: %s", exc, exc_info=exc)
+            response = ORJSONResponse(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                content=create_error_response(
+                    status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    "Internal server error",
+                    {"error": str(exc)}
+                ),
+            )
+            await response(scope, receive, send)
+
+app = FastAPI(title="Unreal-Blender MCP Server", default_response_class=ORJSONResponse)
+
+# Innermost middleware, so its error responses still pass through CORS and gzip
+app.add_middleware(ErrorResponseMiddleware)
 
 # Add CORS middleware
 app.add_middleware(
@@ -54,8 +132,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON payloads (scene info, status, tool lists) once they are large enough to benefit
+app.add_middleware(
+    StreamAwareGZipMiddleware,
+    exclude_paths=("/sse", "/message"),
+    minimum_size=1024,
+    compresslevel=5,
+)
+
+# Blender/Unreal connections are blocking, so tool calls run in the default executor
+TOOL_EXECUTOR_WORKERS = 32
+
+# Concurrent tool calls allowed per backend. Blender is driven over a single
+# socket, so its commands must not interleave; Unreal is served over HTTP.
+BLENDER_MAX_CONCURRENCY = 1
+UNREAL_MAX_CONCURRENCY = 4
+
+# Per-connection SSE buffer; events for a client that falls this far behind are dropped
+STREAM_QUEUE_MAXSIZE = 1024
+
+# Seconds between SSE keep-alive pings; sse-starlette sends them and watches for
+# client disconnects itself, so idle streams otherwise stay parked on the queue
+SSE_HEARTBEAT_INTERVAL = 45
+
+@dataclass(slots=True)
+class StreamConnection:
+    """State kept for each open SSE stream."""
+    queue: asyncio.Queue
+    # time.monotonic_ns() readings
+    created_at: int
+    last_active: int
+
 # Store active connections
-active_connections: Dict[str, Dict[str, Any]] = {}
+active_connections: Dict[str, StreamConnection] = {}
 
 # Message models
 class Message(BaseModel):
@@ -88,7 +197,7 @@ try:
     blender_connection = get_extended_blender_connection()
     logger.info("Successfully connected to Blender")
 except Exception as e:
-    logger.warning(f"Failed to connect to Blender: {str(e)}")
+    logger.warning("Failed to connect to Blender: %s", e)
     logger.warning("Using dummy Blender connection instead. Some features may not work.")
     blender_connection = DummyBlenderConnection()
 
@@ -97,64 +206,254 @@ unreal_connection = UnrealConnection()
 langchain_manager = LangchainManager()
 tool_handler = ToolHandler(blender_connection, unreal_connection)
 
+# System prompts, examples and tool definitions are fixed for the lifetime of the
+# process, so build them once instead of on every /ai/* request.
+_PROMPT_BUILDERS = {
+    "claude": get_claude_system_prompt,
+    "chatgpt": get_chatgpt_system_prompt,
+    "cursor": get_cursor_system_prompt,
+}
+_PROMPT_CACHE: Dict[Tuple[str, bool, bool], str] = {
+    (ai_type, include_blender, include_unreal): builder(include_blender, include_unreal)
+    for ai_type, builder in _PROMPT_BUILDERS.items()
+    for include_blender in (True, False)
+    for include_unreal in (True, False)
+}
+_EXAMPLE_CONVERSATIONS = get_example_conversations()
+_AVAILABLE_TOOLS = tool_handler.list_available_tools()
+_TOOLS_BY_CATEGORY: Dict[str, List[Dict[str, Any]]] = {}
+for _tool in _AVAILABLE_TOOLS:
+    _TOOLS_BY_CATEGORY.setdefault(_tool.get("category"), []).append(_tool)
+
 # Custom exception handlers
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors in a standardized way."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content=ErrorResponse(
-            code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            message="Validation error",
-            details={"errors": exc.errors()}
-        ).dict(),
+        content=create_error_response(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            "Validation error",
+            {"errors": exc.errors()}
+        ),
     )
 
+@functools.lru_cache(maxsize=256)
+def _http_error_body(status_code: int, detail: str) -> bytes:
+    """Serialized error envelope for an HTTPException; most (code, detail) pairs repeat."""
+    return orjson.dumps(create_error_response(status_code, detail))
+
 @app.exception_handler(HTTPException)
 async def custom_http_exception_handler(request: Request, exc: HTTPException):
     """Handle HTTP exceptions in a standardized way."""
-    return JSONResponse(
+    if isinstance(exc.detail, str):
+        return Response(
+            _http_error_body(exc.status_code, exc.detail),
+            status_code=exc.status_code,
+            media_type="application/json",
+            headers=exc.headers,
+        )
+    return ORJSONResponse(
         status_code=exc.status_code,
-        content=ErrorResponse(
-            code=exc.status_code,
-            message=exc.detail,
-            details=None
-        ).dict(),
-    )
-
-@app.exception_handler(Exception)
-async def generic_exception_handler(request: Request, exc: Exception):
-    """Handle generic exceptions in a standardized way."""
-    logger.error(f"Unhandled exception: {str(exc)}")
-    logger.error(traceback.format_exc())
-    return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content=ErrorResponse(
-            code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            message="Internal server error",
-            details={"error": str(exc)}
-        ).dict(),
+        content=create_error_response(exc.status_code, exc.detail),
+        headers=exc.headers,
     )
 
 # Utility functions
+def _dumps(obj: Any) -> str:
+    """Serialize an SSE event payload to a JSON string (sse-starlette expects str)."""
+    return orjson.dumps(obj, default=str).decode()
+
+_id_counter = itertools.count()
+
 def generate_id() -> str:
     """Generate a unique ID for messages."""
-    return str(uuid.uuid4())
+    return f"m{next(_id_counter):x}"
+
+def generate_connection_id() -> str:
+    """
+    Generate an ID for an SSE connection.
+    
+    Anyone holding a connection ID can push messages into that stream through
+    /stream/send, so these stay random rather than sequential.
+    """
+    return secrets.token_hex(16)
+
+async def parse_message(request: Request) -> Message:
+    """
+    Validate the raw request body as a Message.
+    
+    Validating the bytes directly with pydantic-core skips FastAPI's intermediate
+    json.loads and dict walk. Failures are reported as regular 422 validation errors.
+    """
+    body = await request.body()
+    try:
+        return Message.model_validate_json(body)
+    except ValidationError as e:
+        # Locate errors under "body", as FastAPI does for body parameters
+        errors = e.errors(include_url=False)
+        for error in errors:
+            error["loc"] = ("body", *error["loc"])
+        raise RequestValidationError(errors)
 
+# parse_message reads the body itself, so FastAPI no longer documents it; describe it
+# for the OpenAPI schema of the routes that take a Message
+_MESSAGE_BODY_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": Message.model_json_schema()}},
+    }
+}
+
+# Outbound payloads are built by the server itself, so they are trusted and are
+# assembled as plain dicts in the SuccessResponse/ErrorResponse shape instead of
+# being re-validated through the models. Inbound Message data is still validated.
 def create_success_response(data: Dict[str, Any], message: Optional[str] = None) -> Dict[str, Any]:
     """Create a standardized success response."""
-    return SuccessResponse(
-        data=data,
-        message=message
-    ).dict()
+    return {"status": "success", "data": data, "message": message}
 
 def create_error_response(code: int, message: str, details: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Create a standardized error response."""
-    return ErrorResponse(
-        code=code,
-        message=message,
-        details=details
-    ).dict()
+    return {"status": "error", "code": code, "message": message, "details": details}
+
+# Byte halves of create_success_response({"results": [...]}, "Message processed")
+_RESULTS_ENVELOPE_HEAD = b'{"status":"success","data":{"results":['
+_RESULTS_ENVELOPE_TAIL = b']},"message":"Message processed"}'
+
+# Fully serialized bodies for the read-only /ai/examples and /ai/tools endpoints.
+# Rebuild these if tool registration ever becomes dynamic.
+_EXAMPLES_BYTES = orjson.dumps(create_success_response({"examples": _EXAMPLE_CONVERSATIONS}))
+_TOOLS_BYTES: Dict[Optional[str], bytes] = {
+    category: orjson.dumps(create_success_response({"tools": tools, "category": category}))
+    for category, tools in _TOOLS_BY_CATEGORY.items()
+    if category
+}
+_TOOLS_BYTES[None] = orjson.dumps(create_success_response({"tools": _AVAILABLE_TOOLS, "category": None}))
+
+def _make_arg_validator(required: Tuple[str, ...]) -> Callable[[Dict[str, Any]], None]:
+    """Build a validator specialised for one tool's required argument names."""
+    if not required:
+        def validate(args: Dict[str, Any]) -> None:
+            pass
+    elif len(required) == 1:
+        (name,) = required
+        message = f"Missing required argument: {name}"
+        
+        def validate(args: Dict[str, Any]) -> None:
+            if name not in args:
+                raise ValueError(message)
+    else:
+        def validate(args: Dict[str, Any]) -> None:
+            missing = [name for name in required if name not in args]
+            if missing:
+                raise ValueError(f"Missing required arguments: {', '.join(missing)}")
+    return validate
+
+# Legacy (non mcp_) tools: name -> (callable taking the tool args, required args).
+# The lambdas look up the connection globals at call time so reconnects are honoured.
+_LEGACY_TOOL_SPECS: Dict[str, Tuple[Callable[[Dict[str, Any]], Any], Tuple[str, ...]]] = {
+    # Blender tool calls
+    "get_scene_info": (lambda args: blender_connection.get_scene_info(), ()),
+    "get_object_info": (lambda args: blender_connection.get_object_info(args["object_name"]), ("object_name",)),
+    "create_object": (
+        lambda args: blender_connection.create_object(
+            type=args["type"],
+            name=args.get("name"),
+            location=args.get("location"),
+            rotation=args.get("rotation"),
+            scale=args.get("scale")
+        ),
+        ("type",),
+    ),
+    "execute_blender_code": (lambda args: blender_connection.execute_code(args["code"]), ("code",)),
+    # Unreal tool calls
+    "create_level": (lambda args: unreal_connection.create_level(args["level_name"]), ("level_name",)),
+    "import_asset": (
+        lambda args: unreal_connection.import_asset(
+            args["file_path"],
+            args["destination_path"],
+            args.get("asset_name")
+        ),
+        ("file_path", "destination_path"),
+    ),
+    "get_engine_version": (lambda args: unreal_connection.get_engine_version(), ()),
+    "execute_unreal_code": (lambda args: unreal_connection.execute_code(args["code"]), ("code",)),
+}
+_LEGACY_TOOLS: Dict[str, Tuple[Callable[[Dict[str, Any]], Any], Callable[[Dict[str, Any]], None]]] = {
+    name: (func, _make_arg_validator(required))
+    for name, (func, required) in _LEGACY_TOOL_SPECS.items()
+}
+
+# Which backend each legacy tool talks to; mcp_* tools are matched by prefix
+_LEGACY_TOOL_BACKENDS = {
+    "get_scene_info": "blender",
+    "get_object_info": "blender",
+    "create_object": "blender",
+    "execute_blender_code": "blender",
+    "create_level": "unreal",
+    "import_asset": "unreal",
+    "get_engine_version": "unreal",
+    "execute_unreal_code": "unreal",
+}
+
+def _create_backend_semaphores() -> Dict[str, asyncio.Semaphore]:
+    """Create the per-backend concurrency limits for the running event loop."""
+    return {
+        "blender": asyncio.Semaphore(BLENDER_MAX_CONCURRENCY),
+        "unreal": asyncio.Semaphore(UNREAL_MAX_CONCURRENCY),
+    }
+
+def _backend_limit(tool_name: str):
+    """Return the concurrency limit guarding the backend a tool talks to."""
+    if tool_name.startswith("mcp_blender_"):
+        backend = "blender"
+    elif tool_name.startswith("mcp_unreal_"):
+        backend = "unreal"
+    else:
+        backend = _LEGACY_TOOL_BACKENDS.get(tool_name)
+    if backend is None:
+        return contextlib.nullcontext()
+    
+    # Semaphores bind to the first loop that waits on them, so they are made per
+    # server run in startup_event; this covers apps driven without startup
+    if getattr(app.state, "backend_semaphores", None) is None:
+        app.state.backend_semaphores = _create_backend_semaphores()
+    return app.state.backend_semaphores[backend]
+
+# Read-only tools whose results are reused for READ_ONLY_TOOL_CACHE_TTL seconds.
+# Any other tool call may change the scene or level, so it empties the cache.
+READ_ONLY_TOOL_CACHE_TTL = 2.0
+READ_ONLY_TOOLS = frozenset({
+    "get_scene_info",
+    "get_object_info",
+    "get_engine_version",
+    "mcp_blender_get_scene_info",
+    "mcp_blender_get_object_info",
+    "mcp_unreal_get_engine_version",
+})
+# Entries are kept in insertion order, which with a fixed TTL is also expiry order
+READ_ONLY_TOOL_CACHE_MAXSIZE = 256
+_tool_result_cache: Dict[Tuple[str, bytes], Tuple[float, Any]] = {}
+# Bumped on every invalidation so reads that were in flight don't store stale results
+_tool_cache_generation = 0
+
+def _store_tool_result(key: Tuple[str, bytes], result: Any) -> None:
+    """Cache a read-only tool result, evicting expired entries and, if still full, the oldest."""
+    now = time.monotonic()
+    _tool_result_cache.pop(key, None)
+    while _tool_result_cache:
+        oldest = next(iter(_tool_result_cache))
+        if _tool_result_cache[oldest][0] > now and len(_tool_result_cache) < READ_ONLY_TOOL_CACHE_MAXSIZE:
+            break
+        del _tool_result_cache[oldest]
+    # Callers may modify the result they get back, so the cache keeps its own copy
+    _tool_result_cache[key] = (now + READ_ONLY_TOOL_CACHE_TTL, copy.deepcopy(result))
+
+def _invalidate_tool_cache() -> None:
+    """Drop all cached read-only tool results."""
+    global _tool_cache_generation
+    _tool_cache_generation += 1
+    _tool_result_cache.clear()
 
 async def handle_tool_call(tool_name: str, tool_args: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -167,124 +466,182 @@ async def handle_tool_call(tool_name: str, tool_args: Dict[str, Any]) -> Dict[st
     Returns:
         Dict with the result of the tool call
     """
-    logger.info(f"Handling tool call: {tool_name} with args: {tool_args}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Handling tool call: %s with args: %s", tool_name, tool_args)
+    
+    if tool_name not in READ_ONLY_TOOLS:
+        _invalidate_tool_cache()
+        try:
+            return await _dispatch_tool_call(tool_name, tool_args)
+        finally:
+            _invalidate_tool_cache()
+    
+    key = (tool_name, orjson.dumps(tool_args, option=orjson.OPT_SORT_KEYS, default=str))
+    cached = _tool_result_cache.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        return copy.deepcopy(cached[1])
     
+    generation = _tool_cache_generation
+    result = await _dispatch_tool_call(tool_name, tool_args)
+    is_error = isinstance(result, dict) and result.get("status") == "error"
+    if not is_error and generation == _tool_cache_generation:
+        _store_tool_result(key, result)
+    return result
+
+async def _dispatch_tool_call(tool_name: str, tool_args: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a tool call against its backend, converting failures into an error result."""
     try:
         # Check if it's an AI tool (prefixed with mcp_)
         if tool_name.startswith("mcp_"):
-            return tool_handler.handle_tool_call(tool_name, tool_args)
+            async with _backend_limit(tool_name):
+                return await asyncio.to_thread(tool_handler.handle_tool_call, tool_name, tool_args)
         
         # Legacy tool calls (for backward compatibility)
-        # Blender tool calls
-        elif tool_name == "get_scene_info":
-            return blender_connection.get_scene_info()
-        elif tool_name == "get_object_info":
-            if "object_name" not in tool_args:
-                raise ValueError("Missing required argument: object_name")
-            return blender_connection.get_object_info(tool_args.get("object_name"))
-        elif tool_name == "create_object":
-            if "type" not in tool_args:
-                raise ValueError("Missing required argument: type")
-            return blender_connection.create_object(
-                type=tool_args.get("type"),
-                name=tool_args.get("name"),
-                location=tool_args.get("location"),
-                rotation=tool_args.get("rotation"),
-                scale=tool_args.get("scale")
-            )
-        elif tool_name == "execute_blender_code":
-            if "code" not in tool_args:
-                raise ValueError("Missing required argument: code")
-            return blender_connection.execute_code(tool_args.get("code"))
-        
-        # Unreal tool calls
-        elif tool_name == "create_level":
-            if "level_name" not in tool_args:
-                raise ValueError("Missing required argument: level_name")
-            return unreal_connection.create_level(tool_args.get("level_name"))
-        elif tool_name == "import_asset":
-            if "file_path" not in tool_args or "destination_path" not in tool_args:
-                raise ValueError("Missing required arguments: file_path and/or destination_path")
-            return unreal_connection.import_asset(
-                tool_args.get("file_path"),
-                tool_args.get("destination_path"),
-                tool_args.get("asset_name")
-            )
-        elif tool_name == "get_engine_version":
-            return unreal_connection.get_engine_version()
-        elif tool_name == "execute_unreal_code":
-            if "code" not in tool_args:
-                raise ValueError("Missing required argument: code")
-            return unreal_connection.execute_code(tool_args.get("code"))
-        
-        # Unknown tool
-        else:
+        legacy = _LEGACY_TOOLS.get(tool_name)
+        if legacy is None:
             return {
                 "status": "error", 
                 "message": f"Unknown tool: {tool_name}"
             }
+        
+        func, validate = legacy
+        validate(tool_args)
+        async with _backend_limit(tool_name):
+            return await asyncio.to_thread(func, tool_args)
     except Exception as e:
-        logger.error(f"Error executing tool {tool_name}: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error executing tool %s: %s", tool_name, e)
         return {
             "status": "error",
             "message": f"Error executing tool {tool_name}: {str(e)}"
         }
 
-async def process_message(message: Message) -> AsyncGenerator[Dict[str, Any], None]:
+async def _run_tool_call(tool_call: Dict[str, Any]) -> Tuple[Dict[str, Any], Any, Optional[Exception]]:
+    """
+    Execute a single tool call, capturing any error.
+    
+    Args:
+        tool_call: Tool call requested by the agent
+        
+    Returns:
+        Tuple of (tool_call, result, error) so results can be matched to their call
+    """
+    tool_name = tool_call.get("name")
+    try:
+        result = await handle_tool_call(tool_name, tool_call.get("arguments", {}))
+        return tool_call, result, None
+    except Exception as e:
+        logger.exception("Error executing tool %s: %s", tool_name, e)
+        return tool_call, None, e
+
+# Sequence for Langchain memory keys; unlike timestamps it can never repeat
+_message_counter = itertools.count()
+
+# Inbound messages are written to Langchain memory in batches by a background task
+# (started on server startup) so storage never sits on the tool dispatch path.
+MEMORY_FLUSH_BATCH = 64
+MEMORY_FLUSH_INTERVAL = 0.5
+_memory_queue: Optional[asyncio.Queue] = None
+_memory_writer_task: Optional[asyncio.Task] = None
+# Queued on shutdown: the writer stores what it has collected and returns. Cancelling
+# it instead is unreliable, as wait_for can swallow a cancellation (Python < 3.12).
+_MEMORY_WRITER_STOP = object()
+
+def _store_message_memory(key: str, value: Any) -> None:
+    """Hand a message to the memory writer, or store it directly if the writer isn't running."""
+    if _memory_queue is None:
+        langchain_manager.store_memory(key, value)
+    else:
+        _memory_queue.put_nowait((key, value))
+
+async def _memory_writer() -> None:
+    """Flush queued messages every MEMORY_FLUSH_BATCH items or MEMORY_FLUSH_INTERVAL seconds."""
+    loop = asyncio.get_running_loop()
+    stopping = False
+    while not stopping:
+        item = await _memory_queue.get()
+        if item is _MEMORY_WRITER_STOP:
+            return
+        batch = [item]
+        deadline = loop.time() + MEMORY_FLUSH_INTERVAL
+        try:
+            while len(batch) < MEMORY_FLUSH_BATCH:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(_memory_queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is _MEMORY_WRITER_STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+        finally:
+            # Also runs on cancellation, so a partly collected batch is not lost.
+            # The vector store write blocks, so keep it off the event loop.
+            try:
+                await asyncio.to_thread(langchain_manager.store_memories, batch)
+            except Exception as e:
+                logger.error("Error storing %d messages in memory: %s", len(batch), e)
+
+async def process_message(message: Message, raw: Optional[bytes] = None) -> AsyncGenerator[Dict[str, Any], None]:
     """
     Process a message from the AI agent.
     
     Args:
         message: The message to process
+        raw: The JSON body the message was validated from, stored in memory as-is
         
     Yields:
         Dict with the processed message or tool call result
     """
     try:
         # Store message in Langchain memory
-        langchain_manager.store_memory(f"message_{int(time.time())}", message.dict())
+        _store_message_memory(f"message_{next(_message_counter)}", raw if raw is not None else message)
         
-        # If message has tool calls, process them
+        # If message has tool calls, run them concurrently and report each as it finishes
         if message.tool_calls:
-            for tool_call in message.tool_calls:
-                tool_name = tool_call.get("name")
-                tool_args = tool_call.get("arguments", {})
-                
-                try:
-                    result = await handle_tool_call(tool_name, tool_args)
-                    yield {
-                        "event": "tool_result",
-                        "data": json.dumps({
-                            "tool_call_id": tool_call.get("id"),
-                            "result": result
-                        })
-                    }
-                except Exception as e:
-                    logger.error(f"Error executing tool {tool_name}: {str(e)}")
-                    logger.error(traceback.format_exc())
-                    yield {
-                        "event": "tool_error",
-                        "data": json.dumps({
-                            "tool_call_id": tool_call.get("id"),
-                            "error": str(e)
-                        })
-                    }
+            tasks = [
+                asyncio.create_task(_run_tool_call(tool_call))
+                for tool_call in message.tool_calls
+            ]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    tool_call, result, error = await next_done
+                    if error is None:
+                        yield {
+                            "event": "tool_result",
+                            "data": _dumps({
+                                "tool_call_id": tool_call.get("id"),
+                                "result": result
+                            })
+                        }
+                    else:
+                        yield {
+                            "event": "tool_error",
+                            "data": _dumps({
+                                "tool_call_id": tool_call.get("id"),
+                                "error": str(error)
+                            })
+                        }
+            finally:
+                # The consumer may stop early (e.g. client disconnect); don't leak tool calls
+                for task in tasks:
+                    task.cancel()
         else:
             # Regular message, just acknowledge receipt
             yield {
                 "event": "message_received",
-                "data": json.dumps({
+                "data": _dumps({
                     "id": message.id or generate_id(),
                     "status": "success"
                 })
             }
     except Exception as e:
-        logger.error(f"Error processing message: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error processing message: %s", e)
         yield {
             "event": "error",
-            "data": json.dumps({
+            "data": _dumps({
                 "status": "error",
                 "message": str(e)
             })
@@ -300,7 +657,7 @@ async def root():
         blender_status = "connected" if blender_connection.extended_features_enabled else "disconnected"
         unreal_status = "connected" if unreal_connection.is_connected else "disconnected"
         
-        return create_success_response({
+        return ORJSONResponse(create_success_response({
             "name": "Unreal-Blender MCP Server",
             "status": "running",
             "connections": {
@@ -308,9 +665,9 @@ async def root():
                 "unreal": unreal_status
             },
             "active_streams": len(active_connections)
-        }, "Server is running")
+        }, "Server is running"))
     except Exception as e:
-        logger.error(f"Error in root endpoint: {str(e)}")
+        logger.error("Error in root endpoint: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/sse")
@@ -323,23 +680,22 @@ async def stream_endpoint(request: Request):
     """
     try:
         # Generate a unique connection ID
-        connection_id = generate_id()
+        connection_id = generate_connection_id()
         
         # Create a new queue for this connection
-        queue = asyncio.Queue()
+        queue = asyncio.Queue(maxsize=STREAM_QUEUE_MAXSIZE)
         
         # Store connection in active_connections
-        active_connections[connection_id] = {
-            "queue": queue,
-            "created_at": time.time()
-        }
+        now = time.monotonic_ns()
+        connection = StreamConnection(queue, now, now)
+        active_connections[connection_id] = connection
         
-        logger.info(f"New SSE connection established: {connection_id}")
+        logger.info("New SSE connection established: %s", connection_id)
         
         # Send initial connection message
         await queue.put({
             "event": "connected",
-            "data": json.dumps({
+            "data": _dumps({
                 "connection_id": connection_id,
                 "message": "Connection established"
             })
@@ -349,62 +705,78 @@ async def stream_endpoint(request: Request):
             try:
                 # Keep the connection open
                 while True:
-                    # Get the next message from the queue
-                    message = await queue.get()
-                    
-                    # Check if the message is a disconnect signal
-                    if message.get("event") == "disconnect":
-                        break
+                    # Wait for the next message, then drain whatever else is already queued
+                    batch = [await queue.get()]
+                    while True:
+                        try:
+                            batch.append(queue.get_nowait())
+                        except asyncio.QueueEmpty:
+                            break
+                    connection.last_active = time.monotonic_ns()
                     
-                    # Yield the message to the client
-                    yield message
-                    
-                    # Mark the task as done
-                    queue.task_done()
+                    for message in batch:
+                        # Check if the message is a disconnect signal
+                        if message.get("event") == "disconnect":
+                            return
+                        
+                        # Yield the message to the client
+                        yield message
             except asyncio.CancelledError:
-                logger.info(f"Stream connection closed: {connection_id}")
+                logger.info("Stream connection closed: %s", connection_id)
             finally:
                 # Remove connection when client disconnects
-                if connection_id in active_connections:
-                    del active_connections[connection_id]
-                logger.info(f"Stream connection removed: {connection_id}")
+                active_connections.pop(connection_id, None)
+                logger.info("Stream connection removed: %s", connection_id)
         
         # Return the event stream
-        return EventSourceResponse(event_generator())
+        return EventSourceResponse(event_generator(), ping=SSE_HEARTBEAT_INTERVAL)
     except Exception as e:
-        logger.error(f"Error in stream endpoint: {str(e)}")
+        logger.error("Error in stream endpoint: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/message")
-async def message_endpoint(message: Message):
+@app.post("/message", openapi_extra=_MESSAGE_BODY_OPENAPI)
+async def message_endpoint(request: Request, message: Message = Depends(parse_message), stream: bool = True):
     """
     Process a message from an AI agent.
     
     Args:
+        request: The incoming request; its body was already read by parse_message
         message: The message to process
+        stream: Stream results as newline-delimited JSON as they complete;
+            pass stream=false to receive them in a single success response
         
     Returns:
-        Dict with the result
+        NDJSON stream of results, or Dict with all results when stream=false
     """
-    try:
-        # For non-streaming responses, collect all results
-        results = []
-        async for result in process_message(message):
-            results.append(result)
-        
-        return create_success_response({
-            "results": results
-        }, "Message processed")
-    except Exception as e:
-        logger.error(f"Error in message endpoint: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    # Starlette caches the body, so this returns the bytes parse_message validated
+    body = await request.body()
+    
+    if stream:
+        async def ndjson_generator():
+            async for result in process_message(message, body):
+                yield orjson.dumps(result, default=str) + b"\n"
+        
+        return StreamingResponse(ndjson_generator(), media_type="application/x-ndjson")
+    
+    # For non-streaming responses, write the usual success envelope but emit each
+    # result into its "results" array as it arrives instead of collecting a list
+    async def envelope_generator():
+        yield _RESULTS_ENVELOPE_HEAD
+        separator = b""
+        async for result in process_message(message, body):
+            yield separator + orjson.dumps(result, default=str)
+            separator = b","
+        yield _RESULTS_ENVELOPE_TAIL
+    
+    return StreamingResponse(envelope_generator(), media_type="application/json")
 
-@app.post("/stream/send")
-async def send_to_stream(message: Message, connection_id: str):
+@app.post("/stream/send", openapi_extra=_MESSAGE_BODY_OPENAPI)
+async def send_to_stream(request: Request, connection_id: str, message: Message = Depends(parse_message)):
     """
     Send a message to a specific stream connection.
     
     Args:
+        request: The incoming request; its body was already read by parse_message
         message: The message to send
         connection_id: ID of the connection to send to
         
@@ -412,34 +784,39 @@ async def send_to_stream(message: Message, connection_id: str):
         Dict with the result
     """
     try:
-        # Check if the connection exists
-        if connection_id not in active_connections:
+        # Look up the connection once; a missing entry means it does not exist
+        connection = active_connections.get(connection_id)
+        if connection is None:
             raise HTTPException(status_code=404, detail=f"Connection not found: {connection_id}")
         
         # Get the connection queue
-        queue = active_connections[connection_id]["queue"]
+        queue = connection.queue
+        body = await request.body()
         
         # Process the message and send results to the queue
         background_tasks = BackgroundTasks()
         
         async def process_and_queue():
-            async for result in process_message(message):
-                await queue.put(result)
+            async for result in process_message(message, body):
+                try:
+                    queue.put_nowait(result)
+                except asyncio.QueueFull:
+                    logger.warning("Stream queue full, dropping %s event for connection: %s", result.get("event"), connection_id)
         
         # Add the task to the background tasks
         background_tasks.add_task(process_and_queue)
         
-        return JSONResponse(
+        return ORJSONResponse(
             content=create_success_response({
                 "connection_id": connection_id,
                 "message": "Message sent to stream"
             }),
             background=background_tasks
         )
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error in send_to_stream endpoint: {str(e)}")
-        if isinstance(e, HTTPException):
-            raise e
+        logger.error("Error in send_to_stream endpoint: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/ai/prompts")
@@ -461,27 +838,22 @@ async def get_ai_prompts(
         include_blender = platform in [None, "blender", "both"]
         include_unreal = platform in [None, "unreal", "both"]
         
-        if ai_type == "claude":
-            prompt = get_claude_system_prompt(include_blender, include_unreal)
-        elif ai_type == "chatgpt":
-            prompt = get_chatgpt_system_prompt(include_blender, include_unreal)
-        elif ai_type == "cursor":
-            prompt = get_cursor_system_prompt(include_blender, include_unreal)
-        else:
+        prompt = _PROMPT_CACHE.get((ai_type, include_blender, include_unreal))
+        if prompt is None:
             raise HTTPException(status_code=400, detail=f"Unsupported AI type: {ai_type}")
         
-        return create_success_response({
+        return ORJSONResponse(create_success_response({
             "prompt": prompt,
             "ai_type": ai_type,
             "platforms": {
                 "blender": include_blender,
                 "unreal": include_unreal
             }
-        })
+        }))
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error in get_ai_prompts endpoint: {str(e)}")
-        if isinstance(e, HTTPException):
-            raise e
+        logger.error("Error in get_ai_prompts endpoint: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/ai/examples")
@@ -493,12 +865,9 @@ async def get_ai_examples():
         Dict with example conversations
     """
     try:
-        examples = get_example_conversations()
-        return create_success_response({
-            "examples": examples
-        })
+        return Response(_EXAMPLES_BYTES, media_type="application/json")
     except Exception as e:
-        logger.error(f"Error in get_ai_examples endpoint: {str(e)}")
+        logger.error("Error in get_ai_examples endpoint: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/ai/tools")
@@ -513,60 +882,77 @@ async def get_ai_tools(category: Optional[str] = None):
         Dict with available tools
     """
     try:
-        tools = tool_handler.list_available_tools()
-        
-        if category:
-            tools = [tool for tool in tools if tool.get("category") == category]
+        cached = _TOOLS_BYTES.get(category or None)
+        if cached is not None:
+            return Response(cached, media_type="application/json")
         
-        return create_success_response({
+        tools = _TOOLS_BY_CATEGORY.get(category, [])
+        return ORJSONResponse(create_success_response({
             "tools": tools,
             "category": category
-        })
+        }))
     except Exception as e:
-        logger.error(f"Error in get_ai_tools endpoint: {str(e)}")
+        logger.error("Error in get_ai_tools endpoint: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+# Reconnect attempts made by /status are blocking and can take seconds when a
+# backend is down, so their outcome is reused for STATUS_PROBE_TTL seconds.
+STATUS_PROBE_TTL = 5.0
+# The lock guarding it lives on app.state and is made per event loop, see startup_event
+_status_probe: Dict[str, Any] = {"checked_at": None, "result": None}
+
+async def _probe_connection(connection: Any, connected: bool) -> Dict[str, Any]:
+    """Report one backend's status, trying to connect if it is not already connected."""
+    status = {"connected": connected}
+    if not connected:
+        try:
+            await asyncio.to_thread(connection.connect)
+            status["connected"] = True
+            status["message"] = "Connected successfully"
+        except Exception as e:
+            status["error"] = str(e)
+    return status
+
+async def _probe_connections() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Return the (blender, unreal) connection status, reconnecting at most once per TTL."""
+    # Covers apps driven without startup_event, such as a bare TestClient
+    if getattr(app.state, "status_probe_lock", None) is None:
+        app.state.status_probe_lock = asyncio.Lock()
+    
+    async with app.state.status_probe_lock:
+        checked_at = _status_probe["checked_at"]
+        if checked_at is not None and time.monotonic() - checked_at < STATUS_PROBE_TTL:
+            return _status_probe["result"]
+        
+        # The two backends are independent, so probe them concurrently
+        blender_status, unreal_status = await asyncio.gather(
+            _probe_connection(blender_connection, blender_connection.extended_features_enabled),
+            _probe_connection(unreal_connection, unreal_connection.is_connected),
+        )
+        
+        _status_probe["checked_at"] = time.monotonic()
+        _status_probe["result"] = (blender_status, unreal_status)
+        return blender_status, unreal_status
+
 @app.get("/status")
 async def status_endpoint():
     """Get the status of all connections."""
     try:
-        # Try to connect to Blender if not already connected
-        blender_status = {
-            "connected": blender_connection.extended_features_enabled
-        }
-        if not blender_connection.extended_features_enabled:
-            try:
-                blender_connection.connect()  # 이제 동기 메서드 사용
-                blender_status["connected"] = True
-                blender_status["message"] = "Connected successfully"
-            except Exception as e:
-                blender_status["error"] = str(e)
-        
-        # Try to connect to Unreal if not already connected
-        unreal_status = {
-            "connected": unreal_connection.is_connected
-        }
-        if not unreal_connection.is_connected:
-            try:
-                unreal_connection.connect()
-                unreal_status["connected"] = True
-                unreal_status["message"] = "Connected successfully"
-            except Exception as e:
-                unreal_status["error"] = str(e)
+        blender_status, unreal_status = await _probe_connections()
         
-        return create_success_response({
+        return ORJSONResponse(create_success_response({
             "server": {
                 "status": "running",
-                "uptime": time.time() - startup_time
+                "uptime": time.monotonic() - startup_time
             },
             "connections": {
                 "blender": blender_status,
                 "unreal": unreal_status
             },
             "active_streams": len(active_connections)
-        })
+        }))
     except Exception as e:
-        logger.error(f"Error in status endpoint: {str(e)}")
+        logger.error("Error in status endpoint: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # Server events
@@ -576,9 +962,26 @@ startup_time = 0
 async def startup_event():
     """Initialize connections on server startup."""
     global startup_time
-    startup_time = time.time()
+    startup_time = time.monotonic()
     logger.info("Server starting up...")
     
+    # Size the default executor used by asyncio.to_thread for blocking tool calls
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=TOOL_EXECUTOR_WORKERS, thread_name_prefix="mcp-tool")
+    )
+    
+    # Fresh backend concurrency limits for this event loop
+    app.state.backend_semaphores = _create_backend_semaphores()
+    
+    # The /status probe cache and its lock start over with each run
+    _status_probe.update(checked_at=None, result=None)
+    app.state.status_probe_lock = asyncio.Lock()
+    
+    # Start the batched Langchain memory writer
+    global _memory_queue, _memory_writer_task
+    _memory_queue = asyncio.Queue()
+    _memory_writer_task = asyncio.create_task(_memory_writer())
+    
     # Connect to Blender and Unreal
     global blender_connection
     if isinstance(blender_connection, DummyBlenderConnection):
@@ -590,7 +993,7 @@ async def startup_event():
             blender_connection = real_connection
             logger.info("Connected to Blender")
         except Exception as e:
-            logger.warning(f"Could not connect to Blender: {str(e)}")
+            logger.warning("Could not connect to Blender: %s", e)
     else:
         # 이미 연결된 경우 연결 확인
         try:
@@ -598,25 +1001,39 @@ async def startup_event():
             blender_connection.send_command("get_scene_info")
             logger.info("Connected to Blender")
         except Exception as e:
-            logger.warning(f"Blender connection validation failed: {str(e)}")
+            logger.warning("Blender connection validation failed: %s", e)
             try:
                 # 다시 연결 시도
                 blender_connection.connect()
                 logger.info("Reconnected to Blender")
             except Exception as reconnect_error:
-                logger.warning(f"Could not reconnect to Blender: {str(reconnect_error)}")
+                logger.warning("Could not reconnect to Blender: %s", reconnect_error)
     
     try:
-        unreal_connection.connect()
+        await unreal_connection.connect_async()
         logger.info("Connected to Unreal Engine")
     except Exception as e:
-        logger.warning(f"Could not connect to Unreal Engine: {str(e)}")
+        logger.warning("Could not connect to Unreal Engine: %s", e)
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up when the server shuts down."""
     logger.info("Server shutting down...")
     
+    # Stop the memory writer and store whatever it had not flushed yet
+    global _memory_queue, _memory_writer_task
+    if _memory_writer_task is not None:
+        _memory_queue.put_nowait(_MEMORY_WRITER_STOP)
+        await _memory_writer_task
+        # Messages queued behind the stop marker
+        pending = []
+        while not _memory_queue.empty():
+            pending.append(_memory_queue.get_nowait())
+        if pending:
+            await asyncio.to_thread(langchain_manager.store_memories, pending)
+        _memory_queue = None
+        _memory_writer_task = None
+    
     # Clean up connections
     try:
         # Get all extended connection instances
@@ -625,7 +1042,7 @@ async def shutdown_event():
         else:
             logger.warning("Blender connection does not have disconnect method")
     except Exception as e:
-        logger.error(f"Error disconnecting from Blender: {str(e)}")
+        logger.error("Error disconnecting from Blender: %s", e)
     
     try:
         # Properly close the Unreal connection
@@ -634,13 +1051,13 @@ async def shutdown_event():
         else:
             logger.warning("Unreal connection does not have disconnect method")
     except Exception as e:
-        logger.error(f"Error disconnecting from Unreal Engine: {str(e)}")
+        logger.error("Error disconnecting from Unreal Engine: %s", e)
     
     # Clean up all active connections
     for conn_id, conn_data in list(active_connections.items()):
         try:
             active_connections.pop(conn_id)
         except Exception as e:
-            logger.error(f"Error cleaning up connection {conn_id}: {str(e)}")
+            logger.error("Error cleaning up connection %s: %s", conn_id, e)
     
     logger.info("Server shutdown complete") 
\ No newline at end of file
@@ -6,11 +6,48 @@ This module provides functionality to communicate with the Unreal Engine plugin.
 
 import logging
 import json
+import asyncio
+import functools
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional, Union
 
 logger = logging.getLogger(__name__)
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Script templates sent to the Unreal plugin; rendered through _render_script
+_CREATE_LEVEL_TMPL = "import unreal\nunreal.EditorLevelLibrary.new_level('{level_name}')"
+
+_IMPORT_ASSET_TMPL = """
+import unreal
+import os
+
+file_path = '{file_path}'
+destination_path = '{destination_path}'
+
+task = unreal.AssetImportTask()
+task.filename = file_path
+task.destination_path = destination_path
+task.automated = True
+task.save = True
+
+unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks([task])
+print(f"Imported {{os.path.basename(file_path)}} to {{destination_path}}")
+"""
+
+_ENGINE_VERSION_SCRIPT = """
+import unreal
+version = unreal.SystemLibrary.get_engine_version()
+print(version)
+"""
+
+@functools.lru_cache(maxsize=256)
+def _render_script(template: str, **kwargs: str) -> str:
+    """Render a script template, memoized on the template and its arguments."""
+    return template.format(**kwargs)
+
 class UnrealConnection:
     """Class for managing connections to Unreal Engine."""
     
@@ -25,7 +62,15 @@ class UnrealConnection:
         self.host = host
         self.port = port
         self.base_url = f"http://{host}:{port}"
+        self.execute_url = f"{self.base_url}/execute"
+        # Informational only; updated from the responses actually observed
         self.is_connected = False
+        
+        # Pooled keep-alive connections shared by every request to the plugin
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
     
     def connect(self) -> bool:
         """
@@ -36,7 +81,7 @@ class UnrealConnection:
         """
         try:
             # Test connection with a simple request
-            response = requests.get(f"{self.base_url}/status", timeout=5)
+            response = self._session.get(f"{self.base_url}/status", timeout=5)
             if response.status_code == 200:
                 logger.info(f"Connected to Unreal Engine on {self.host}:{self.port}")
                 self.is_connected = True
@@ -50,11 +95,27 @@ class UnrealConnection:
             self.is_connected = False
             return False
     
+    async def connect_async(self) -> bool:
+        """Async variant of connect; the request runs on a worker thread."""
+        return await asyncio.to_thread(self.connect)
+    
     def disconnect(self) -> None:
         """Close the connection to Unreal Engine."""
         self.is_connected = False
+        # Drops the pooled sockets; the session reconnects if used again
+        self._session.close()
         logger.info("Unreal Engine connection closed")
     
+    def close(self) -> None:
+        """Alias of disconnect, for use with contextlib.closing and similar helpers."""
+        self.disconnect()
+    
+    def __enter__(self) -> "UnrealConnection":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.disconnect()
+    
     def execute_code(self, code: str) -> Dict[str, Any]:
         """
         Execute Python code in Unreal Engine.
@@ -65,66 +126,53 @@ class UnrealConnection:
         Returns:
             Dict with the execution result and/or error information
         """
-        if not self.is_connected:
-            connected = self.connect()
-            if not connected:
-                return {"status": "error", "message": "Not connected to Unreal Engine"}
-        
+        # No /status probe first: a failed POST reports the same connection error
         try:
-            payload = {
-                "code": code
-            }
-            
-            response = requests.post(
-                f"{self.base_url}/execute", 
-                json=payload, 
+            response = self._session.post(
+                self.execute_url, 
+                data=orjson.dumps({"code": code}), 
+                headers=_JSON_HEADERS,
                 timeout=30
             )
+            self.is_connected = True
             
             if response.status_code == 200:
-                return response.json()
+                return orjson.loads(response.content)
             else:
                 error_text = response.text
                 logger.error(f"Error from Unreal Engine: {error_text}")
                 return {"status": "error", "message": f"Unreal Engine returned {response.status_code}: {error_text}"}
+        except requests.ConnectionError as e:
+            logger.error(f"Error connecting to Unreal Engine: {str(e)}")
+            self.is_connected = False
+            return {"status": "error", "message": f"Not connected to Unreal Engine: {str(e)}"}
         except Exception as e:
             logger.error(f"Error executing Unreal Engine code: {str(e)}")
             return {"status": "error", "message": str(e)}
     
+    async def execute_code_async(self, code: str) -> Dict[str, Any]:
+        """
+        Async variant of execute_code.
+        
+        The blocking request runs on a worker thread, so several calls can be
+        in flight at once without stalling the event loop.
+        """
+        return await asyncio.to_thread(self.execute_code, code)
+    
     # Convenience methods for common Unreal Engine operations
     def create_level(self, level_name: str) -> Dict[str, Any]:
         """Create a new level in Unreal Engine."""
-        code = f"import unreal\nunreal.EditorLevelLibrary.new_level('{level_name}')"
+        code = _render_script(_CREATE_LEVEL_TMPL, level_name=level_name)
         return self.execute_code(code)
     
     def import_asset(self, file_path: str, destination_path: str, asset_name: Optional[str] = None) -> Dict[str, Any]:
         """Import an asset into Unreal Engine."""
-        code = f"""
-import unreal
-import os
-
-file_path = '{file_path}'
-destination_path = '{destination_path}'
-
-task = unreal.AssetImportTask()
-task.filename = file_path
-task.destination_path = destination_path
-task.automated = True
-task.save = True
-
-unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks([task])
-print(f"Imported {os.path.basename(file_path)} to {destination_path}")
-"""
+        code = _render_script(_IMPORT_ASSET_TMPL, file_path=file_path, destination_path=destination_path)
         return self.execute_code(code)
     
     def get_engine_version(self) -> Dict[str, Any]:
         """Get the Unreal Engine version."""
-        code = """
-import unreal
-version = unreal.SystemLibrary.get_engine_version()
-print(version)
-"""
-        return self.execute_code(code)
+        return self.execute_code(_ENGINE_VERSION_SCRIPT)
         
     def execute_command(self, command_type: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
         """일반 명령 실행 메서드 추가"""
@@ -139,7 +187,4 @@ print(version)
         try:
             return {"status": "success", "message": f"Command {command_type} not implemented yet", "params": params}
         except Exception as e:
-            return {"status": "error", "message": f"Error executing command {command_type}: {str(e)}"}
-
-# Create a global instance for convenience
-unreal_connection = UnrealConnection() 
\ No newline at end of file
+            return {"status": "error", "message": f"Error executing command {command_type}: {str(e)}"} 
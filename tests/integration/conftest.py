@@ -0,0 +1,28 @@
+"""
+Pytest configuration for the integration tests.
+
+Used when the suite runs under pytest-xdist (run_integration_tests.py --parallel).
+"""
+
+import pytest
+
+def _backend_group(test_name: str) -> str:
+    """Name of the xdist group for a test, based on the backend it drives."""
+    if 'mcp' in test_name and 'connection' in test_name:
+        return 'mcp'
+    if 'unreal' in test_name and 'blender' not in test_name and 'mcp' not in test_name:
+        return 'unreal'
+    # Blender-only tests, plus the tests that drive both backends and so must
+    # not race the Blender-only ones over the shared scene
+    return 'blender'
+
+def pytest_configure(config):
+    """Register the xdist_group marker so it is known even without pytest-xdist."""
+    config.addinivalue_line(
+        "markers", "xdist_group(name): run the marked tests on the same xdist worker"
+    )
+
+def pytest_collection_modifyitems(config, items):
+    """Serialize tests of the same backend while the backend groups run in parallel."""
+    for item in items:
+        item.add_marker(pytest.mark.xdist_group(_backend_group(item.name)))
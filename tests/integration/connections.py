@@ -3,22 +3,82 @@ Utility module for handling connections to Blender and Unreal Engine during test
 """
 
 import os
-import json
 import asyncio
 import aiohttp
+import orjson
+import functools
 import tempfile
-from typing import Dict, Any, Optional, Union
+import weakref
+from typing import Dict, Any, List, Optional, Union, Callable, Awaitable
 
 from tests.integration.test_config import (
-    get_blender_server_url,
-    get_unreal_server_url,
-    get_mcp_server_url
+    BLENDER_SERVER_URL,
+    UNREAL_SERVER_URL,
+    MCP_SERVER_URL
 )
 
+# Endpoint URLs used by the helpers below
+BLENDER_PING_URL = f"{BLENDER_SERVER_URL}/ping"
+BLENDER_EXECUTE_URL = f"{BLENDER_SERVER_URL}/execute"
+UNREAL_STATUS_URL = f"{UNREAL_SERVER_URL}/status"
+UNREAL_EXECUTE_URL = f"{UNREAL_SERVER_URL}/execute"
+MCP_STATUS_URL = f"{MCP_SERVER_URL}/status"
+MCP_MESSAGE_URL = f"{MCP_SERVER_URL}/message"
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Shared timeouts for liveness checks and for script/message execution
+PING_TIMEOUT = aiohttp.ClientTimeout(total=5)
+EXEC_TIMEOUT = aiohttp.ClientTimeout(total=30)
+
 class ConnectionError(Exception):
     """Exception raised for connection errors."""
     pass
 
+# One shared session per event loop, so successive requests reuse keep-alive
+# connections. Sessions are bound to the loop they were created on and tests may
+# run several loops, hence the weak per-loop mapping.
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+
+def _get_session() -> aiohttp.ClientSession:
+    """
+    Get the shared ClientSession for the running event loop, creating it on first use.
+    
+    Returns:
+        aiohttp.ClientSession: The session for the current loop.
+    """
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=32, limit_per_host=8, keepalive_timeout=60, enable_cleanup_closed=True
+            )
+        )
+        _sessions[loop] = session
+    return session
+
+async def close_session() -> None:
+    """Close the shared ClientSession of the running event loop, if one was created."""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+@functools.lru_cache(maxsize=128)
+def _read_script_cached(path: str, mtime_ns: int) -> str:
+    """
+    Read a script file; the modification time in the key invalidates edited files.
+    
+    Args:
+        path: Path to the script file.
+        mtime_ns: Modification time of the file, in nanoseconds.
+        
+    Returns:
+        str: The file contents.
+    """
+    with open(path, 'r') as f:
+        return f.read()
+
 async def ping_blender() -> bool:
     """
     Check if Blender server is running.
@@ -27,9 +87,9 @@ async def ping_blender() -> bool:
         bool: True if Blender server is running, False otherwise.
     """
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{get_blender_server_url()}/ping", timeout=5) as response:
-                return response.status == 200
+        session = _get_session()
+        async with session.get(BLENDER_PING_URL, timeout=PING_TIMEOUT) as response:
+            return response.status == 200
     except Exception:
         return False
 
@@ -41,9 +101,9 @@ async def ping_unreal() -> bool:
         bool: True if Unreal server is running, False otherwise.
     """
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{get_unreal_server_url()}/status", timeout=5) as response:
-                return response.status == 200
+        session = _get_session()
+        async with session.get(UNREAL_STATUS_URL, timeout=PING_TIMEOUT) as response:
+            return response.status == 200
     except Exception:
         return False
 
@@ -55,9 +115,9 @@ async def ping_mcp() -> bool:
         bool: True if MCP server is running, False otherwise.
     """
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{get_mcp_server_url()}/status", timeout=5) as response:
-                return response.status == 200
+        session = _get_session()
+        async with session.get(MCP_STATUS_URL, timeout=PING_TIMEOUT) as response:
+            return response.status == 200
     except Exception:
         return False
 
@@ -74,22 +134,22 @@ async def execute_blender_script(script: str) -> Dict[str, Any]:
     Raises:
         ConnectionError: If unable to connect to Blender.
     """
-    if not await ping_blender():
-        raise ConnectionError("Blender server is not running")
-    
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{get_blender_server_url()}/execute",
-                json={"code": script},
-                timeout=30
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    return result
-                else:
-                    error_text = await response.text()
-                    raise ConnectionError(f"Blender returned error: {error_text}")
+        session = _get_session()
+        async with session.post(
+            BLENDER_EXECUTE_URL,
+            data=orjson.dumps({"code": script}),
+            headers=_JSON_HEADERS,
+            timeout=EXEC_TIMEOUT
+        ) as response:
+            if response.status == 200:
+                result = await response.json(loads=orjson.loads)
+                return result
+            else:
+                error_text = await response.text()
+                raise ConnectionError(f"Blender returned error: {error_text}")
+    except aiohttp.ClientConnectorError as e:
+        raise ConnectionError(f"Blender server is not running: {str(e)}")
     except aiohttp.ClientError as e:
         raise ConnectionError(f"Failed to connect to Blender: {str(e)}")
 
@@ -106,25 +166,66 @@ async def execute_unreal_script(script: str) -> Dict[str, Any]:
     Raises:
         ConnectionError: If unable to connect to Unreal Engine.
     """
-    if not await ping_unreal():
-        raise ConnectionError("Unreal Engine server is not running")
-    
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{get_unreal_server_url()}/execute",
-                json={"code": script},
-                timeout=30
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    return result
-                else:
-                    error_text = await response.text()
-                    raise ConnectionError(f"Unreal Engine returned error: {error_text}")
+        session = _get_session()
+        async with session.post(
+            UNREAL_EXECUTE_URL,
+            data=orjson.dumps({"code": script}),
+            headers=_JSON_HEADERS,
+            timeout=EXEC_TIMEOUT
+        ) as response:
+            if response.status == 200:
+                result = await response.json(loads=orjson.loads)
+                return result
+            else:
+                error_text = await response.text()
+                raise ConnectionError(f"Unreal Engine returned error: {error_text}")
+    except aiohttp.ClientConnectorError as e:
+        raise ConnectionError(f"Unreal Engine server is not running: {str(e)}")
     except aiohttp.ClientError as e:
         raise ConnectionError(f"Failed to connect to Unreal Engine: {str(e)}")
 
+# Script executors by application name
+_DISPATCH: Dict[str, Callable[[str], Awaitable[Dict[str, Any]]]] = {
+    'blender': execute_blender_script,
+    'unreal': execute_unreal_script,
+}
+
+async def execute_script_bytes(
+    content: Union[bytes, str],
+    app: str,
+    data: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Execute already loaded script source in the specified application.
+    
+    Args:
+        content: The script source, as UTF-8 bytes or text.
+        app: 'blender' or 'unreal'
+        data: Optional data to pass to the script.
+        
+    Returns:
+        dict: The result of the script execution.
+        
+    Raises:
+        ValueError: If the app is not 'blender' or 'unreal'.
+        ConnectionError: If unable to connect to the application.
+    """
+    execute = _DISPATCH.get(app)
+    if execute is None:
+        raise ValueError("app must be 'blender' or 'unreal'")
+    
+    script = content.decode('utf-8') if isinstance(content, bytes) else content
+    
+    # Add data to the script if provided
+    if data:
+        # Scripts receive data as a JSON string; repr() quotes it safely
+        data_json = orjson.dumps(data).decode()
+        script = f"data = {data_json!r}\n{script}"
+    
+    # Execute the script
+    return await execute(script)
+
 async def execute_script_file(file_path: str, app: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Execute a Python script file in the specified application.
@@ -142,26 +243,17 @@ async def execute_script_file(file_path: str, app: str, data: Optional[Dict[str,
         FileNotFoundError: If the script file does not exist.
         ConnectionError: If unable to connect to the application.
     """
-    if app not in ['blender', 'unreal']:
+    if app not in _DISPATCH:
         raise ValueError("app must be 'blender' or 'unreal'")
     
-    if not os.path.exists(file_path):
+    try:
+        mtime_ns = os.stat(file_path).st_mtime_ns
+    except FileNotFoundError:
         raise FileNotFoundError(f"Script file not found: {file_path}")
     
-    # Read the script file
-    with open(file_path, 'r') as f:
-        script = f.read()
-    
-    # Add data to the script if provided
-    if data:
-        data_str = json.dumps(data)
-        script = f"data = '''{data_str}'''\n{script}"
-    
-    # Execute the script
-    if app == 'blender':
-        return await execute_blender_script(script)
-    else:  # app == 'unreal'
-        return await execute_unreal_script(script)
+    # Read the script file, reusing the cached contents while it is unchanged
+    script = _read_script_cached(file_path, mtime_ns)
+    return await execute_script_bytes(script, app, data)
 
 async def send_mcp_message(message: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -176,35 +268,92 @@ async def send_mcp_message(message: Dict[str, Any]) -> Dict[str, Any]:
     Raises:
         ConnectionError: If unable to connect to the MCP server.
     """
-    if not await ping_mcp():
-        raise ConnectionError("MCP server is not running")
-    
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{get_mcp_server_url()}/message",
-                json=message,
-                timeout=30
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    return result
-                else:
-                    error_text = await response.text()
-                    raise ConnectionError(f"MCP server returned error: {error_text}")
+        session = _get_session()
+        async with session.post(
+            MCP_MESSAGE_URL,
+            params={"stream": "false"},
+            data=orjson.dumps(message),
+            headers=_JSON_HEADERS,
+            timeout=EXEC_TIMEOUT
+        ) as response:
+            if response.status == 200:
+                result = await response.json(loads=orjson.loads)
+                return result
+            else:
+                error_text = await response.text()
+                raise ConnectionError(f"MCP server returned error: {error_text}")
+    except aiohttp.ClientConnectorError as e:
+        raise ConnectionError(f"MCP server is not running: {str(e)}")
     except aiohttp.ClientError as e:
         raise ConnectionError(f"Failed to connect to MCP server: {str(e)}")
 
+async def send_mcp_batch(tool_calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Send several tool calls to the MCP server in a single /message request.
+    
+    The server runs the tool calls of one message concurrently and reports each
+    result tagged with its tool call ID, so the whole batch costs one round-trip.
+    
+    Args:
+        tool_calls: Tool calls as {"tool": name, "args": {...}} dicts.
+        
+    Returns:
+        list: One {"status": ..., "result"/"message": ...} entry per tool call, in input order.
+        
+    Raises:
+        ConnectionError: If unable to connect to the MCP server, or if it fails
+            to process the message as a whole.
+    """
+    message = {
+        "role": "assistant",
+        "content": "",
+        "tool_calls": [
+            {"id": f"call_{index}", "name": call["tool"], "arguments": call.get("args", {})}
+            for index, call in enumerate(tool_calls)
+        ]
+    }
+    response = await send_mcp_message(message)
+    
+    # Results arrive in completion order; put them back in request order
+    entries: List[Dict[str, Any]] = [
+        {"status": "error", "message": "No result returned"} for _ in tool_calls
+    ]
+    for event in response.get("data", {}).get("results", []):
+        payload = orjson.loads(event["data"])
+        tool_call_id = payload.get("tool_call_id")
+        if tool_call_id is None:
+            # Not tied to one tool call: the server failed to process the message
+            raise ConnectionError(f"MCP server returned error: {payload.get('message')}")
+        index = int(tool_call_id.removeprefix("call_"))
+        if event["event"] == "tool_result":
+            # Unknown tools and invalid arguments are reported as a tool_result
+            # whose result carries the error status
+            result = payload["result"]
+            if isinstance(result, dict) and result.get("status") == "error":
+                entries[index] = {"status": "error", "message": result.get("message")}
+            else:
+                entries[index] = {"status": "success", "result": result}
+        else:
+            entries[index] = {"status": "error", "message": payload["error"]}
+    return entries
+
 async def execute_cross_platform_workflow(
     blender_script_path: str,
-    unreal_script_path: str
+    unreal_script_path: str,
+    unreal_prepare_script_path: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Execute a cross-platform workflow, typically exporting from Blender and importing to Unreal.
     
+    Only the Unreal import depends on the Blender result, so the optional
+    preparation script runs in Unreal while Blender is still exporting.
+    
     Args:
         blender_script_path: Path to the Blender script file.
         unreal_script_path: Path to the Unreal script file.
+        unreal_prepare_script_path: Optional Unreal script with no dependency on
+            the Blender result, e.g. creating the destination folder or level.
         
     Returns:
         dict: The combined results of both script executions.
@@ -212,8 +361,21 @@ async def execute_cross_platform_workflow(
     Raises:
         ConnectionError: If unable to connect to either application.
     """
-    # Execute the Blender script
-    blender_result = await execute_script_file(blender_script_path, 'blender')
+    # Run the Blender export alongside the Unreal preparation; without one,
+    # a ping at least warms the Unreal connection
+    if unreal_prepare_script_path is not None:
+        unreal_prelude = execute_script_file(unreal_prepare_script_path, 'unreal')
+    else:
+        unreal_prelude = ping_unreal()
+    
+    blender_result, prepare_result = await asyncio.gather(
+        execute_script_file(blender_script_path, 'blender'),
+        unreal_prelude,
+        return_exceptions=True
+    )
+    for outcome in (blender_result, prepare_result):
+        if isinstance(outcome, BaseException):
+            raise outcome
     
     # Extract the export path from the Blender result
     if blender_result.get('status') != 'success':
@@ -223,6 +385,14 @@ async def execute_cross_platform_workflow(
             'blender_result': blender_result
         }
     
+    if unreal_prepare_script_path is not None and prepare_result.get('status') != 'success':
+        return {
+            'status': 'error',
+            'message': f"Unreal preparation script failed: {prepare_result.get('message', 'Unknown error')}",
+            'blender_result': blender_result,
+            'unreal_prepare_result': prepare_result
+        }
+    
     # Execute the Unreal script with the Blender result data
     unreal_result = await execute_script_file(unreal_script_path, 'unreal', blender_result)
     
@@ -3,6 +3,7 @@ Configuration settings for integration tests.
 """
 
 import os
+import orjson
 from typing import Dict, Any
 
 # MCP Server settings
@@ -17,6 +18,11 @@ BLENDER_PORT = 8400
 UNREAL_HOST = "localhost"
 UNREAL_PORT = 8500
 
+# Server base URLs, built once from the settings above
+MCP_SERVER_URL = f"http://{MCP_SERVER_HOST}:{MCP_SERVER_PORT}"
+BLENDER_SERVER_URL = f"http://{BLENDER_HOST}:{BLENDER_PORT}"
+UNREAL_SERVER_URL = f"http://{UNREAL_HOST}:{UNREAL_PORT}"
+
 # Test data paths
 TEST_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "test_data")
 
@@ -41,6 +47,10 @@ print(f"Created actor: {cube.get_name()}")
 return f"Created actor: {cube.get_name()}"
 """
 
+# Pre-encoded /execute request bodies for the sample scripts
+SAMPLE_BLENDER_PAYLOAD = orjson.dumps({"code": SAMPLE_BLENDER_SCRIPT})
+SAMPLE_UNREAL_PAYLOAD = orjson.dumps({"code": SAMPLE_UNREAL_SCRIPT})
+
 # Test scenario configurations
 TEST_SCENARIOS = {
     "blender_basic": {
@@ -63,12 +73,12 @@ def get_test_script_path(script_name: str) -> str:
 
 def get_mcp_server_url() -> str:
     """Get the URL for the MCP server."""
-    return f"http://{MCP_SERVER_HOST}:{MCP_SERVER_PORT}"
+    return MCP_SERVER_URL
 
 def get_blender_server_url() -> str:
     """Get the URL for the Blender server."""
-    return f"http://{BLENDER_HOST}:{BLENDER_PORT}"
+    return BLENDER_SERVER_URL
 
 def get_unreal_server_url() -> str:
     """Get the URL for the Unreal server."""
-    return f"http://{UNREAL_HOST}:{UNREAL_PORT}" 
\ No newline at end of file
+    return UNREAL_SERVER_URL 
\ No newline at end of file
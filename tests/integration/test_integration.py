@@ -6,6 +6,8 @@ import os
 import sys
 import json
 import asyncio
+import functools
+import importlib
 import unittest
 import tempfile
 from typing import Dict, Any, List, Tuple
@@ -14,15 +16,39 @@ from tests.integration.test_config import (
     get_test_script_path,
     TEST_SCENARIOS
 )
-from tests.integration.connections import (
-    ping_blender,
-    ping_unreal,
-    ping_mcp,
-    execute_script_file,
-    execute_cross_platform_workflow,
-    send_mcp_message,
-    ConnectionError
-)
+
+# Paths of the test_data scripts used below, resolved once
+SCRIPTS = {
+    name: get_test_script_path(f"{name}.py")
+    for name in (
+        'create_cube',
+        'create_material',
+        'create_actor',
+        'create_blueprint',
+        'export_from_blender',
+        'import_to_unreal',
+    )
+}
+
+# Seconds to wait for each service ping in setUpClass
+PING_TIMEOUT = 5.0
+
+def requires(*services: str):
+    """
+    Skip the decorated test unless every named service answered its ping.
+    
+    Args:
+        services: Any of 'blender', 'unreal' and 'mcp'.
+    """
+    def decorator(test):
+        @functools.wraps(test)
+        def wrapper(self, *args, **kwargs):
+            down = [service for service in services if not getattr(self, f"_{service}_up")]
+            if down:
+                self.skipTest(f"Service not running: {', '.join(down)}")
+            return test(self, *args, **kwargs)
+        return wrapper
+    return decorator
 
 class IntegrationTests(unittest.TestCase):
     """Integration tests for the unreal-blender-mcp system."""
@@ -30,99 +56,130 @@ class IntegrationTests(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Set up the test environment."""
-        # Ensure all components are running
+        # One event loop for the whole class, so the shared HTTP session and its
+        # keep-alive connections survive from test to test
+        cls.loop = asyncio.new_event_loop()
+        
+        # The connection helpers pull in aiohttp; import them only once the class
+        # actually runs, so loading or filtering this module stays cheap
+        cls.connections = importlib.import_module('tests.integration.connections')
+        
+        # The test_data scripts never change during a run; read each one once
+        cls._script_cache = {}
+        for name, path in SCRIPTS.items():
+            with open(path, 'rb') as f:
+                cls._script_cache[name] = f.read()
+        
+        # Ping every service once, concurrently; the connection tests reuse the results
+        cls._pings = cls._run(cls.ping_services())
+        cls._blender_up, cls._unreal_up, cls._mcp_up = cls._pings
+        
+        # Tests that need a service that is down are skipped, not the whole run
         try:
-            asyncio.run(cls.check_services())
-        except ConnectionError as e:
+            cls.check_services()
+        except cls.connections.ConnectionError as e:
             print(f"Service check failed: {e}")
-            print("Please ensure all components (MCP, Blender, Unreal) are running")
-            sys.exit(1)
+            print("Tests needing the missing components (MCP, Blender, Unreal) will be skipped")
     
     @classmethod
-    async def check_services(cls):
-        """Check if all required services are running."""
+    def tearDownClass(cls):
+        """Close the shared HTTP session and the event loop."""
+        try:
+            cls._run(cls.connections.close_session())
+        finally:
+            cls.loop.close()
+    
+    @classmethod
+    def _run(cls, coro):
+        """Run a coroutine to completion on the class event loop."""
+        return cls.loop.run_until_complete(coro)
+    
+    @classmethod
+    async def ping_services(cls) -> Tuple[bool, bool, bool]:
+        """Ping Blender, Unreal and the MCP server concurrently."""
+        # Bound each ping so one dead backend cannot stall the whole suite
         tasks = [
-            ping_blender(),
-            ping_unreal(),
-            ping_mcp()
+            asyncio.wait_for(ping(), PING_TIMEOUT)
+            for ping in (cls.connections.ping_blender, cls.connections.ping_unreal, cls.connections.ping_mcp)
         ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
         
-        blender_alive, unreal_alive, mcp_alive = await asyncio.gather(*tasks)
+        # Timeouts and other exceptions count as not alive
+        blender_alive, unreal_alive, mcp_alive = (result is True for result in results)
+        return blender_alive, unreal_alive, mcp_alive
+    
+    @classmethod
+    def check_services(cls):
+        """Check if all required services are running."""
+        blender_alive, unreal_alive, mcp_alive = cls._pings
         
         if not blender_alive:
-            raise ConnectionError("Blender server is not running")
+            raise cls.connections.ConnectionError("Blender server is not running")
         
         if not unreal_alive:
-            raise ConnectionError("Unreal Engine server is not running")
+            raise cls.connections.ConnectionError("Unreal Engine server is not running")
         
         if not mcp_alive:
-            raise ConnectionError("MCP server is not running")
+            raise cls.connections.ConnectionError("MCP server is not running")
     
+    @requires('blender')
     def test_blender_connection(self):
         """Test connection to Blender."""
-        result = asyncio.run(ping_blender())
-        self.assertTrue(result, "Failed to connect to Blender")
+        self.assertTrue(self._pings[0], "Failed to connect to Blender")
     
+    @requires('unreal')
     def test_unreal_connection(self):
         """Test connection to Unreal Engine."""
-        result = asyncio.run(ping_unreal())
-        self.assertTrue(result, "Failed to connect to Unreal Engine")
+        self.assertTrue(self._pings[1], "Failed to connect to Unreal Engine")
     
+    @requires('mcp')
     def test_mcp_connection(self):
         """Test connection to MCP server."""
-        result = asyncio.run(ping_mcp())
-        self.assertTrue(result, "Failed to connect to MCP server")
+        self.assertTrue(self._pings[2], "Failed to connect to MCP server")
     
+    @requires('blender')
     def test_blender_create_cube(self):
         """Test creating a cube in Blender."""
-        script_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'test_data', 'create_cube.py')
-        result = asyncio.run(execute_script_file(script_path, 'blender'))
+        result = self._run(self.connections.execute_script_bytes(self._script_cache['create_cube'], 'blender'))
         self.assertEqual(result.get('status'), 'success', f"Failed to create cube: {result.get('message')}")
         self.assertEqual(result.get('object_name'), 'TestCube')
     
+    @requires('blender')
     def test_blender_create_material(self):
         """Test creating a material in Blender."""
-        script_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'test_data', 'create_material.py')
-        result = asyncio.run(execute_script_file(script_path, 'blender'))
+        result = self._run(self.connections.execute_script_bytes(self._script_cache['create_material'], 'blender'))
         self.assertEqual(result.get('status'), 'success', f"Failed to create material: {result.get('message')}")
         self.assertEqual(result.get('material_name'), 'TestMaterial')
     
+    @requires('unreal')
     def test_unreal_create_actor(self):
         """Test creating an actor in Unreal Engine."""
-        script_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'test_data', 'create_actor.py')
-        result = asyncio.run(execute_script_file(script_path, 'unreal'))
+        result = self._run(self.connections.execute_script_bytes(self._script_cache['create_actor'], 'unreal'))
         self.assertEqual(result.get('status'), 'success', f"Failed to create actor: {result.get('message')}")
         self.assertEqual(result.get('actor_label'), 'TestCube')
     
+    @requires('unreal')
     def test_unreal_create_blueprint(self):
         """Test creating a blueprint in Unreal Engine."""
-        script_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'test_data', 'create_blueprint.py')
-        result = asyncio.run(execute_script_file(script_path, 'unreal'))
+        result = self._run(self.connections.execute_script_bytes(self._script_cache['create_blueprint'], 'unreal'))
         self.assertEqual(result.get('status'), 'success', f"Failed to create blueprint: {result.get('message')}")
         self.assertEqual(result.get('blueprint_name'), 'TestBlueprint')
     
+    @requires('blender', 'unreal')
     def test_cross_platform_workflow(self):
         """Test cross-platform workflow (export from Blender, import to Unreal)."""
-        blender_script_path = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)), 
-            'test_data', 
-            'export_from_blender.py'
-        )
-        unreal_script_path = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)), 
-            'test_data', 
-            'import_to_unreal.py'
-        )
-        
-        result = asyncio.run(execute_cross_platform_workflow(blender_script_path, unreal_script_path))
+        result = self._run(self.connections.execute_cross_platform_workflow(
+            SCRIPTS['export_from_blender'],
+            SCRIPTS['import_to_unreal']
+        ))
         self.assertEqual(result.get('status'), 'success', f"Cross-platform workflow failed: {result.get('message')}")
         self.assertEqual(result.get('blender_result', {}).get('object_name'), 'ExportSphere')
         self.assertEqual(result.get('unreal_result', {}).get('asset_name'), 'ImportedSphere')
     
-    def test_mcp_blender_tool_execution(self):
-        """Test executing a Blender tool through the MCP server."""
-        message = {
-            "type": "tool_call",
+    @requires('mcp', 'blender', 'unreal')
+    def test_mcp_tool_batch(self):
+        """Test executing Blender and Unreal tools through the MCP server in one request."""
+        blender_call = {
             "tool": "mcp_blender_create_primitive",
             "args": {
                 "type": "CUBE",
@@ -130,14 +187,7 @@ class IntegrationTests(unittest.TestCase):
                 "color": [1, 0, 0]
             }
         }
-        
-        result = asyncio.run(send_mcp_message(message))
-        self.assertEqual(result.get('status'), 'success', f"MCP Blender tool execution failed: {result.get('message')}")
-    
-    def test_mcp_unreal_tool_execution(self):
-        """Test executing an Unreal tool through the MCP server."""
-        message = {
-            "type": "tool_call",
+        unreal_call = {
             "tool": "mcp_unreal_execute_code",
             "args": {
                 "code": """
@@ -154,8 +204,9 @@ print(f"Created actor: {cube.get_name()}")
             }
         }
         
-        result = asyncio.run(send_mcp_message(message))
-        self.assertEqual(result.get('status'), 'success', f"MCP Unreal tool execution failed: {result.get('message')}")
+        blender_result, unreal_result = self._run(self.connections.send_mcp_batch([blender_call, unreal_call]))
+        self.assertEqual(blender_result.get('status'), 'success', f"MCP Blender tool execution failed: {blender_result.get('message')}")
+        self.assertEqual(unreal_result.get('status'), 'success', f"MCP Unreal tool execution failed: {unreal_result.get('message')}")
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -5,15 +5,18 @@ This module contains integration tests that verify multiple components
 of the MCP server working together with simulated client requests.
 """
 
+import os
 import unittest
 import asyncio
 import json
 from unittest.mock import patch, MagicMock, AsyncMock
 
-from fastapi.testclient import TestClient
+import httpx
 import pytest
+import pytest_asyncio
 
 from src.unreal_blender_mcp.server import app
+from tests.utils.asgi_transport import StreamingASGITransport
 from tests.utils.request_simulator import RequestSimulator, MockConnection
 
 
@@ -52,9 +55,13 @@ class TestServerIntegration:
         self.mock_blender.execute_code = self.blender_mock.execute_code
         
         self.mock_unreal.connect = self.unreal_mock.connect
-        self.mock_unreal.get_engine_version = self.unreal_mock.get_engine_version
-        self.mock_unreal.create_level = self.unreal_mock.create_level
         self.mock_unreal.execute_code = self.unreal_mock.execute_code
+        
+        # SSE stream shared by the stream tests, opened on first use
+        self._sse_simulator = None
+        self._sse_resp = None
+        self._sse_reader = None
+        self._sse_queue = None
     
     async def teardown_mocks(self):
         """Tear down mock connections."""
@@ -62,32 +69,75 @@ class TestServerIntegration:
         self.unreal_patch.stop()
         self.langchain_patch.stop()
     
-    @pytest.fixture
+    async def _open_sse_stream(self, client: httpx.AsyncClient) -> RequestSimulator:
+        """
+        Connect to the SSE stream once and queue its events in the background.
+        
+        Args:
+            client: The client to open the stream with
+            
+        Returns:
+            The simulator owning the stream connection
+        """
+        if self._sse_simulator is None:
+            self._sse_simulator = await RequestSimulator(client=client).__aenter__()
+            self._sse_conn_id, self._sse_resp = await self._sse_simulator.connect_stream()
+            self._sse_queue = asyncio.Queue()
+            self._sse_reader = asyncio.create_task(self._drain(self._sse_resp))
+        return self._sse_simulator
+    
+    async def _drain(self, response):
+        """Push every event of the stream into the queue."""
+        async for event in self._sse_simulator.read_stream_events(response):
+            await self._sse_queue.put(event)
+    
+    async def _close_sse_stream(self):
+        """Stop the stream reader and close the stream connection."""
+        if self._sse_simulator is None:
+            return
+        self._sse_reader.cancel()
+        try:
+            await self._sse_reader
+        except asyncio.CancelledError:
+            pass
+        await self._sse_simulator.__aexit__(None, None, None)
+        self._sse_simulator = None
+    
+    @pytest_asyncio.fixture
     async def client(self):
-        """Create a test client with mock connections."""
+        """Create an in-process async client with mock connections."""
         await self.setup_mocks()
         try:
-            with TestClient(app) as client:
-                yield client
+            # Serve the app on the test's own event loop instead of a TestClient
+            # thread; the streaming transport also carries the endless SSE response
+            async with httpx.AsyncClient(
+                transport=StreamingASGITransport(app),
+                base_url="http://test"
+            ) as client:
+                try:
+                    yield client
+                finally:
+                    # The stream must close while its client is still open
+                    await self._close_sse_stream()
         finally:
             await self.teardown_mocks()
     
     async def test_server_status(self, client):
         """Test getting the server status."""
         # Start simulator
-        async with RequestSimulator() as simulator:
+        async with RequestSimulator(client=client) as simulator:
             # Get server status
             status = await simulator.get_server_status()
             
             # Verify status response
             assert status["status"] == "success"
             assert "server" in status["data"]
-            assert "active_connections" in status["data"]
+            assert "active_streams" in status["data"]
     
     async def test_basic_message(self, client):
         """Test sending a basic message."""
         # Start simulator
-        async with RequestSimulator() as simulator:
+        async with RequestSimulator(client=client) as simulator:
             # Send a simple message
             response = await simulator.send_message("user", "Hello, server!")
             
@@ -98,7 +148,7 @@ class TestServerIntegration:
     async def test_blender_tool_call(self, client):
         """Test calling a Blender tool."""
         # Start simulator
-        async with RequestSimulator() as simulator:
+        async with RequestSimulator(client=client) as simulator:
             # Simulate a tool call to get scene info
             response = await simulator.simulate_tool_call("get_scene_info")
             
@@ -112,7 +162,7 @@ class TestServerIntegration:
     async def test_conversation_sequence(self, client):
         """Test a sequence of conversation messages."""
         # Start simulator
-        async with RequestSimulator() as simulator:
+        async with RequestSimulator(client=client) as simulator:
             # Simulate a conversation
             messages = [
                 {"role": "user", "content": "Hello, I want to create a scene in Blender"},
@@ -132,44 +182,38 @@ class TestServerIntegration:
         # This test is more complex because it involves streaming events
         # We'll just verify that we can connect and send a message
         
-        # Start simulator
-        async with RequestSimulator() as simulator:
-            # Connect to stream
-            connection_id, response = await simulator.connect_stream()
-            
-            # Verify connection
-            assert response.status == 200
-            
-            # Try to read one event (should be a heartbeat)
-            async for event in simulator.read_stream_events(response):
-                # Check that we got some kind of event
-                assert event is not None
-                # Only read one event for this test
-                break
-            
-            # Send a message to the stream
-            message_response = await simulator.send_stream_message("user", "Hello via stream")
-            
-            # Verify response
-            assert message_response["status"] == "success"
+        # Use the shared stream connection
+        simulator = await self._open_sse_stream(client)
+        
+        # Verify connection; the server announced the connection ID
+        assert self._sse_resp.status_code == 200
+        assert self._sse_conn_id
+        
+        # Send a message to the stream
+        message_response = await simulator.send_stream_message("user", "Hello via stream")
+        
+        # Verify response
+        assert message_response["status"] == "success"
+        
+        # The message is acknowledged on the stream
+        event = await asyncio.wait_for(self._sse_queue.get(), timeout=60)
+        assert event["status"] == "success"
     
     async def test_error_handling(self, client):
         """Test error handling in various scenarios."""
-        # Start simulator
-        async with RequestSimulator() as simulator:
-            # Test with invalid message (missing role)
-            async with simulator.session.post(
-                f"{simulator.base_url}/message",
-                json={"content": "No role specified"}
-            ) as response:
-                data = await response.json()
-                
-                # Verify error response
-                assert response.status == 422
-                assert data["status"] == "error"
-                assert "message" in data
-                assert "code" in data
-                assert "details" in data
+        # Test with invalid message (missing role)
+        response = await client.post(
+            "/message",
+            json={"content": "No role specified"}
+        )
+        data = response.json()
+        
+        # Verify error response
+        assert response.status_code == 422
+        assert data["status"] == "error"
+        assert "message" in data
+        assert "code" in data
+        assert "details" in data
 
 
 # Make the tests run with unittest
@@ -178,6 +222,9 @@ class TestServerIntegrationSync(unittest.TestCase):
     
     def test_server_integration(self):
         """Run all async tests using pytest."""
+        # pytest already collects the async tests itself; re-entering it would run them twice
+        if os.environ.get("PYTEST_CURRENT_TEST"):
+            self.skipTest("Already running under pytest")
         pytest.main(["-xvs", __file__])
 
 
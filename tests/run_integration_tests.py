@@ -6,12 +6,16 @@ Script to run integration tests for the unreal-blender-mcp system.
 import os
 import sys
 import unittest
+import compileall
 import argparse
 import logging
 from typing import List, Optional
 
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+INTEGRATION_TESTS_DIR = os.path.join(PROJECT_ROOT, 'tests', 'integration')
+
 # Add the project root directory to the Python path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, PROJECT_ROOT)
 
 def setup_logging(verbose: bool = False):
     """Set up logging configuration."""
@@ -22,20 +26,47 @@ def setup_logging(verbose: bool = False):
         datefmt='%Y-%m-%d %H:%M:%S'
     )
 
-def run_tests(test_pattern: Optional[str] = None, verbose: bool = False) -> int:
+def run_tests_parallel(test_pattern: Optional[str] = None, verbose: bool = False) -> int:
+    """
+    Run the integration tests across pytest-xdist workers.
+    
+    Tests are grouped by backend (see tests/integration/conftest.py), so tests
+    that share a backend run on the same worker while the groups run in parallel.
+    
+    Args:
+        test_pattern: Optional pattern to filter tests.
+        verbose: Whether to enable verbose output.
+        
+    Returns:
+        int: The pytest exit code (0 if every test passed).
+    """
+    import pytest
+    
+    args = ['-n', 'auto', '--dist', 'loadgroup', '-p', 'no:cacheprovider', INTEGRATION_TESTS_DIR]
+    if test_pattern:
+        args += ['-k', test_pattern]
+    if verbose:
+        args.append('-v')
+    return int(pytest.main(args))
+
+def run_tests(test_pattern: Optional[str] = None, verbose: bool = False, parallel: bool = False) -> int:
     """
     Run the integration tests.
     
     Args:
         test_pattern: Optional pattern to filter tests.
         verbose: Whether to enable verbose output.
+        parallel: Run the tests on pytest-xdist workers.
         
     Returns:
-        int: The number of test failures.
+        int: The number of test failures, or the pytest exit code when parallel.
     """
     # Set up logging
     setup_logging(verbose)
     
+    if parallel:
+        return run_tests_parallel(test_pattern, verbose)
+    
     # Create a test suite
     loader = unittest.TestLoader()
     
@@ -43,8 +74,13 @@ def run_tests(test_pattern: Optional[str] = None, verbose: bool = False) -> int:
         # Run specific tests
         suite = loader.loadTestsFromName(f'integration.test_integration.IntegrationTests.{test_pattern}')
     else:
-        # Run all tests
-        suite = loader.discover('tests/integration', pattern='test_*.py')
+        # Byte-compile the test modules up front so a cold CI run does not
+        # compile them one by one during discovery
+        if os.environ.get('CI_PRECOMPILE'):
+            compileall.compile_dir(INTEGRATION_TESTS_DIR, quiet=1)
+        
+        # Run all tests; the explicit top-level dir skips discovery's guessing
+        suite = loader.discover(INTEGRATION_TESTS_DIR, pattern='test_*.py', top_level_dir=PROJECT_ROOT)
     
     # Run the tests
     verbosity = 2 if verbose else 1
@@ -59,6 +95,8 @@ def main():
     parser = argparse.ArgumentParser(description='Run integration tests for unreal-blender-mcp')
     parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output')
     parser.add_argument('-t', '--test', help='Run a specific test (e.g., test_blender_connection)')
+    parser.add_argument('-p', '--parallel', action='store_true',
+                        help='Run tests in parallel with pytest-xdist, one worker per backend group')
     
     args = parser.parse_args()
     
@@ -68,7 +106,7 @@ def main():
     print('=' * 80)
     
     # Run the tests
-    failures = run_tests(args.test, args.verbose)
+    failures = run_tests(args.test, args.verbose, args.parallel)
     
     # Exit with the number of failures
     sys.exit(failures)
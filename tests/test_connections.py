@@ -1,256 +1,266 @@
 """
 Tests for connection classes.
 
-This module contains tests for the BlenderConnection and UnrealConnection classes,
+This module contains tests for the ExtendedBlenderConnection and UnrealConnection classes,
 which handle communication with Blender and Unreal Engine.
 """
 
 import unittest
-from unittest.mock import patch, MagicMock, AsyncMock
-import aiohttp
-from aiohttp import ClientResponseError
+from unittest.mock import patch, MagicMock
+import orjson
+import requests
 
-from src.unreal_blender_mcp.blender_connection import BlenderConnection
+from src.unreal_blender_mcp.blender_addon_server.extended_server import (
+    BlenderConnection,
+    ExtendedBlenderConnection
+)
 from src.unreal_blender_mcp.unreal_connection import UnrealConnection
 
-class TestBlenderConnection(unittest.TestCase):
-    """Test the BlenderConnection class."""
+class TestExtendedBlenderConnection(unittest.IsolatedAsyncioTestCase):
+    """Test the ExtendedBlenderConnection class."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Stub out the upstream connection once for the whole class."""
+        # ExtendedBlenderConnection builds on the upstream BlenderConnection
+        cls.connect_patcher = patch.object(BlenderConnection, 'connect')
+        cls.send_patcher = patch.object(BlenderConnection, 'send_command')
+        cls.sleep_patcher = patch('src.unreal_blender_mcp.blender_addon_server.extended_server.time.sleep')
+        
+        cls.mock_connect = cls.connect_patcher.start()
+        cls.mock_send = cls.send_patcher.start()
+        cls.sleep_patcher.start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the upstream connection stubs."""
+        cls.connect_patcher.stop()
+        cls.send_patcher.stop()
+        cls.sleep_patcher.stop()
     
     def setUp(self):
         """Set up test fixtures."""
-        self.connection = BlenderConnection(host="localhost", port=8400)
-        
-        # Patch ClientSession
-        self.session_patcher = patch('src.unreal_blender_mcp.blender_connection.aiohttp.ClientSession')
-        self.mock_session_class = self.session_patcher.start()
-        self.mock_session = MagicMock()
-        self.mock_session_class.return_value = self.mock_session
+        # Forget the previous test's calls and restore the default responses
+        self.mock_connect.reset_mock(return_value=True, side_effect=True)
+        self.mock_send.reset_mock(return_value=True, side_effect=True)
+        self.mock_connect.return_value = True
+        self.mock_send.return_value = {"objects": []}
         
-        # Set up ClientSession.__aenter__ to return self.mock_session
-        self.mock_session.__aenter__ = AsyncMock(return_value=self.mock_session)
-        self.mock_session.__aexit__ = AsyncMock(return_value=None)
-        
-        # Set up default response
-        self.mock_response = MagicMock()
-        self.mock_response.status = 200
-        self.mock_response.json = AsyncMock(return_value={"status": "success", "result": "ok"})
-        self.mock_session.post = AsyncMock(return_value=self.mock_response)
-    
-    def tearDown(self):
-        """Tear down test fixtures."""
-        self.session_patcher.stop()
+        self.connection = ExtendedBlenderConnection(host="localhost", port=8401)
     
-    async def test_connect(self):
-        """Test the connect method."""
-        # Test successful connection
-        self.mock_response.status = 200
-        self.mock_response.json.return_value = {"status": "success"}
+    def test_connect(self):
+        """Test connecting to an extended addon."""
+        self.mock_send.side_effect = [{"objects": []}, {"extended_version": "0.1.0"}]
         
-        result = await self.connection.connect()
+        result = self.connection.connect()
         self.assertTrue(result)
+        self.assertTrue(self.connection.extended_features_enabled)
+        self.assertEqual(self.connection.extended_version_info, {"extended_version": "0.1.0"})
+    
+    def test_connect_standard_addon(self):
+        """Test connecting to an addon without extended features."""
+        result = self.connection.connect()
+        self.assertTrue(result)
+        self.assertFalse(self.connection.extended_features_enabled)
+        self.assertIsNone(self.connection.extended_version_info)
+    
+    def test_connect_failure(self):
+        """Test that a failed connection is retried and then reported."""
+        self.mock_connect.return_value = False
         
-        # Test failed connection
-        self.mock_response.status = 404
-        
-        result = await self.connection.connect()
-        self.assertFalse(result)
-        
-        # Test exception
-        self.mock_session.post.side_effect = aiohttp.ClientError("Connection error")
-        
-        result = await self.connection.connect()
+        result = self.connection.connect()
         self.assertFalse(result)
+        self.assertEqual(self.mock_connect.call_count, 3)
     
-    async def test_close(self):
-        """Test the close method."""
-        # Test successful close
-        await self.connection.close()
-        self.mock_session.close.assert_called_once()
+    def test_send_extended_command(self):
+        """Test that extended commands need an extended addon."""
+        with self.assertRaises(Exception):
+            self.connection.send_extended_command("get_version_info")
+        
+        self.connection.extended_features_enabled = True
+        result = self.connection.send_extended_command("get_version_info")
+        self.assertEqual(result, {"objects": []})
+        self.mock_send.assert_called_with("get_version_info", None)
     
-    async def test_get_scene_info(self):
-        """Test the get_scene_info method."""
-        self.mock_response.json.return_value = {
-            "status": "success",
-            "result": {"objects": [], "materials": []}
-        }
-        
-        result = await self.connection.get_scene_info()
-        self.assertEqual(result, {"objects": [], "materials": []})
-        
-        # Check correct arguments were passed
-        self.mock_session.post.assert_called_with(
-            "http://localhost:8400/execute",
-            json={"type": "get_scene_info"}
-        )
+    def test_send_command_reconnects_on_lost_connection(self):
+        """Test that a dropped socket is reconnected and the command retried once."""
+        self.connection.sock = MagicMock()
+        self.mock_send.side_effect = [ConnectionError("Broken pipe"), {"objects": ["Cube"]}]
+        
+        result = self.connection.send_command("get_scene_info", {})
+        self.assertEqual(result, {"objects": ["Cube"]})
+        self.assertEqual(self.mock_send.call_count, 2)
+        self.mock_connect.assert_called_once()
     
-    async def test_get_object_info(self):
-        """Test the get_object_info method."""
-        self.mock_response.json.return_value = {
-            "status": "success",
-            "result": {"name": "Cube", "location": [0, 0, 0]}
-        }
-        
-        result = await self.connection.get_object_info("Cube")
-        self.assertEqual(result, {"name": "Cube", "location": [0, 0, 0]})
-        
-        # Check correct arguments were passed
-        self.mock_session.post.assert_called_with(
-            "http://localhost:8400/execute",
-            json={"type": "get_object_info", "name": "Cube"}
-        )
+    def test_send_command_reconnects_on_wrapped_connection_error(self):
+        """Test that upstream's re-raised socket errors also count as a lost connection."""
+        self.connection.sock = MagicMock()
+        
+        # Upstream raises a plain Exception from inside its socket error handler
+        error = Exception("Connection to Blender lost")
+        error.__context__ = ConnectionResetError("Connection reset by peer")
+        self.mock_send.side_effect = [error, {"objects": ["Cube"]}]
+        
+        result = self.connection.send_command("get_scene_info", {})
+        self.assertEqual(result, {"objects": ["Cube"]})
+        self.mock_connect.assert_called_once()
     
-    async def test_execute_code(self):
-        """Test the execute_code method."""
-        self.mock_response.json.return_value = {
-            "status": "success",
-            "result": "Code executed successfully"
-        }
-        
-        result = await self.connection.execute_code("print('Hello')")
-        self.assertEqual(result, "Code executed successfully")
-        
-        # Check correct arguments were passed
-        self.mock_session.post.assert_called_with(
-            "http://localhost:8400/execute",
-            json={"type": "execute_code", "code": "print('Hello')"}
-        )
+    def test_send_command_does_not_retry_other_errors(self):
+        """Test that failures other than a lost connection are raised without a retry."""
+        self.connection.sock = MagicMock()
+        self.mock_send.side_effect = Exception("Timeout waiting for Blender response")
+        
+        with self.assertRaises(Exception):
+            self.connection.send_command("get_scene_info", {})
+        self.mock_send.assert_called_once()
+        self.mock_connect.assert_not_called()
     
-    async def test_error_response(self):
-        """Test handling of error responses."""
-        self.mock_response.json.return_value = {
-            "status": "error",
-            "message": "Error executing code"
-        }
-        
-        result = await self.connection.execute_code("print('Hello')")
-        self.assertEqual(result, {"status": "error", "message": "Error executing code"})
+    async def test_send_command_async(self):
+        """Test the send_command_async method."""
+        result = await self.connection.send_command_async("get_scene_info", {})
+        self.assertEqual(result, {"objects": []})
+        self.mock_send.assert_called_once_with("get_scene_info", {})
 
-class TestUnrealConnection(unittest.TestCase):
+class TestUnrealConnection(unittest.IsolatedAsyncioTestCase):
     """Test the UnrealConnection class."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Patch requests.Session and build the mock session once for the whole class."""
+        cls.session_patcher = patch('src.unreal_blender_mcp.unreal_connection.requests.Session')
+        cls.mock_session = cls.session_patcher.start().return_value
+        
+        cls.mock_response = MagicMock()
+        cls.mock_session.get.return_value = cls.mock_response
+        cls.mock_session.post.return_value = cls.mock_response
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the requests.Session patch."""
+        cls.session_patcher.stop()
+    
     def setUp(self):
         """Set up test fixtures."""
-        self.connection = UnrealConnection(host="localhost", port=8500)
-        
-        # Patch ClientSession
-        self.session_patcher = patch('src.unreal_blender_mcp.unreal_connection.aiohttp.ClientSession')
-        self.mock_session_class = self.session_patcher.start()
-        self.mock_session = MagicMock()
-        self.mock_session_class.return_value = self.mock_session
+        # Forget the previous test's calls and restore the default response
+        self.mock_session.reset_mock()
+        self.mock_session.get.reset_mock(side_effect=True)
+        self.mock_session.post.reset_mock(side_effect=True)
+        self.mock_response.status_code = 200
+        self.mock_response.content = orjson.dumps({"status": "success", "result": "ok"})
         
-        # Set up ClientSession.__aenter__ to return self.mock_session
-        self.mock_session.__aenter__ = AsyncMock(return_value=self.mock_session)
-        self.mock_session.__aexit__ = AsyncMock(return_value=None)
-        
-        # Set up default response
-        self.mock_response = MagicMock()
-        self.mock_response.status = 200
-        self.mock_response.json = AsyncMock(return_value={"result": "ok", "error": None})
-        self.mock_session.post = AsyncMock(return_value=self.mock_response)
+        self.connection = UnrealConnection(host="localhost", port=8500)
     
-    def tearDown(self):
-        """Tear down test fixtures."""
-        self.session_patcher.stop()
+    def assert_executed(self, code):
+        """Check that code was posted to the execute endpoint."""
+        self.mock_session.post.assert_called_with(
+            "http://localhost:8500/execute",
+            data=orjson.dumps({"code": code}),
+            headers={"Content-Type": "application/json"},
+            timeout=30
+        )
     
-    async def test_connect(self):
+    def test_connect(self):
         """Test the connect method."""
         # Test successful connection
-        self.mock_response.status = 200
-        
-        result = await self.connection.connect()
+        result = self.connection.connect()
         self.assertTrue(result)
+        self.assertTrue(self.connection.is_connected)
+        self.mock_session.get.assert_called_with("http://localhost:8500/status", timeout=5)
         
         # Test failed connection
-        self.mock_response.status = 404
+        self.mock_response.status_code = 404
         
-        result = await self.connection.connect()
+        result = self.connection.connect()
         self.assertFalse(result)
+        self.assertFalse(self.connection.is_connected)
         
         # Test exception
-        self.mock_session.post.side_effect = aiohttp.ClientError("Connection error")
+        self.mock_session.get.side_effect = requests.ConnectionError("Connection error")
         
-        result = await self.connection.connect()
+        result = self.connection.connect()
         self.assertFalse(result)
     
-    async def test_close(self):
-        """Test the close method."""
-        # Test successful close
-        await self.connection.close()
-        self.mock_session.close.assert_called_once()
+    async def test_connect_async(self):
+        """Test the connect_async method."""
+        result = await self.connection.connect_async()
+        self.assertTrue(result)
     
-    async def test_create_level(self):
-        """Test the create_level method."""
-        self.mock_response.json.return_value = {
-            "result": "Level created successfully",
-            "error": None
-        }
-        
-        result = await self.connection.create_level("TestLevel")
-        self.assertEqual(result, "Level created successfully")
+    def test_disconnect(self):
+        """Test the disconnect method."""
+        self.connection.is_connected = True
         
-        # Check correct arguments were passed
-        self.mock_session.post.assert_called_with(
-            "http://localhost:8500/execute",
-            json={"code": "unreal.EditorLevelLibrary.new_level('TestLevel')"}
-        )
+        self.connection.disconnect()
+        self.assertFalse(self.connection.is_connected)
+        self.mock_session.close.assert_called_once()
     
-    async def test_import_asset(self):
-        """Test the import_asset method."""
-        self.mock_response.json.return_value = {
-            "result": "Asset imported successfully",
-            "error": None
-        }
+    def test_context_manager(self):
+        """Test that leaving a with block closes the pooled session."""
+        with self.connection as connection:
+            self.assertIs(connection, self.connection)
+            connection.execute_code("print('Hello')")
+        self.assertFalse(self.connection.is_connected)
+        self.mock_session.close.assert_called_once()
         
-        result = await self.connection.import_asset("/path/to/asset.fbx", "/Game/Assets")
-        self.assertEqual(result, "Asset imported successfully")
+        # The session is also closed when the body raises
+        self.mock_session.close.reset_mock()
+        with self.assertRaises(RuntimeError):
+            with UnrealConnection(host="localhost", port=8500) as connection:
+                connection.execute_code("print('Hello')")
+                raise RuntimeError("Import failed")
+        self.assertFalse(connection.is_connected)
+        self.mock_session.close.assert_called_once()
         
-        # Check correct arguments were passed
-        self.mock_session.post.assert_called_with(
-            "http://localhost:8500/execute",
-            json={"code": "unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks([unreal.AssetImportTask(filename='/path/to/asset.fbx', destination_path='/Game/Assets')])[0]"}
-        )
+        # close() is the same as disconnect()
+        self.mock_session.close.reset_mock()
+        self.connection.close()
+        self.mock_session.close.assert_called_once()
     
-    async def test_get_engine_version(self):
-        """Test the get_engine_version method."""
-        self.mock_response.json.return_value = {
-            "result": "5.0.0",
-            "error": None
-        }
-        
-        result = await self.connection.get_engine_version()
-        self.assertEqual(result, "5.0.0")
+    def test_create_level(self):
+        """Test the create_level method."""
+        result = self.connection.create_level("TestLevel")
+        self.assertEqual(result, {"status": "success", "result": "ok"})
+        self.assert_executed("import unreal\nunreal.EditorLevelLibrary.new_level('TestLevel')")
+    
+    def test_import_asset(self):
+        """Test the import_asset method."""
+        self.connection.import_asset("/path/to/asset.fbx", "/Game/Assets")
         
-        # Check correct arguments were passed
-        self.mock_session.post.assert_called_with(
-            "http://localhost:8500/execute",
-            json={"code": "str(unreal.SystemLibrary.get_engine_version())"}
-        )
+        code = orjson.loads(self.mock_session.post.call_args.kwargs["data"])["code"]
+        self.assertIn("file_path = '/path/to/asset.fbx'", code)
+        self.assertIn("destination_path = '/Game/Assets'", code)
+        self.assertIn("import_asset_tasks([task])", code)
     
-    async def test_execute_code(self):
+    def test_execute_code(self):
         """Test the execute_code method."""
-        self.mock_response.json.return_value = {
-            "result": "Code executed successfully",
-            "error": None
-        }
-        
-        result = await self.connection.execute_code("print('Hello')")
-        self.assertEqual(result, "Code executed successfully")
-        
-        # Check correct arguments were passed
-        self.mock_session.post.assert_called_with(
-            "http://localhost:8500/execute",
-            json={"code": "print('Hello')"}
-        )
+        result = self.connection.execute_code("print('Hello')")
+        self.assertEqual(result, {"status": "success", "result": "ok"})
+        self.assertTrue(self.connection.is_connected)
+        self.assert_executed("print('Hello')")
     
-    async def test_error_response(self):
+    async def test_execute_code_async(self):
+        """Test the execute_code_async method."""
+        result = await self.connection.execute_code_async("print('Hello')")
+        self.assertEqual(result, {"status": "success", "result": "ok"})
+        self.assert_executed("print('Hello')")
+    
+    def test_error_response(self):
         """Test handling of error responses."""
-        self.mock_response.json.return_value = {
-            "result": None,
-            "error": "Error executing code"
-        }
+        self.mock_response.status_code = 500
+        self.mock_response.text = "Error executing code"
+        
+        result = self.connection.execute_code("print('Hello')")
+        self.assertEqual(result, {
+            "status": "error",
+            "message": "Unreal Engine returned 500: Error executing code"
+        })
+        
+        # Unreachable plugin
+        self.mock_session.post.side_effect = requests.ConnectionError("Connection refused")
         
-        result = await self.connection.execute_code("print('Hello')")
-        self.assertEqual(result, {"status": "error", "message": "Error executing code"})
+        result = self.connection.execute_code("print('Hello')")
+        self.assertEqual(result["status"], "error")
+        self.assertIn("Not connected to Unreal Engine", result["message"])
+        self.assertFalse(self.connection.is_connected)
 
 if __name__ == "__main__":
-    unittest.main() 
\ No newline at end of file
+    unittest.main()
@@ -7,31 +7,35 @@ import unreal
 # Set the blueprint name and location
 blueprint_name = "TestBlueprint"
 save_path = "/Game/TestBlueprints"
-
-# Make sure the directory exists
-if not unreal.EditorAssetLibrary.does_directory_exist(save_path):
-    unreal.EditorAssetLibrary.make_directory(save_path)
-
-# Create a new blueprint factory
-factory = unreal.BlueprintFactory()
-factory.set_editor_property("ParentClass", unreal.Actor)
-
-# Create the blueprint asset
 blueprint_path = f"{save_path}/{blueprint_name}"
-asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
-new_blueprint = asset_tools.create_asset(blueprint_name, save_path, None, factory)
 
-# Add a static mesh component to the blueprint
-if new_blueprint is not None:
-    # Add component
-    mesh_component = unreal.EditorStaticMeshLibrary.add_static_mesh_component_to_blueprint(
-        new_blueprint,
-        unreal.EditorAssetLibrary.load_asset("/Engine/BasicShapes/Sphere.Sphere")
-    )
+# Load the component mesh once, up front
+sphere_mesh = unreal.EditorAssetLibrary.load_asset("/Engine/BasicShapes/Sphere.Sphere")
+
+# Group the editor changes into a single transaction
+with unreal.ScopedEditorTransaction("Create Test Blueprint"):
+    # Make sure the directory exists (make_directory is a no-op if it already does)
+    unreal.EditorAssetLibrary.make_directory(save_path)
+    
+    # Create a new blueprint factory
+    factory = unreal.BlueprintFactory()
+    factory.set_editor_property("ParentClass", unreal.Actor)
     
-    # Save the blueprint
-    unreal.EditorAssetLibrary.save_asset(blueprint_path)
+    # Create the blueprint asset
+    asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+    new_blueprint = asset_tools.create_asset(blueprint_name, save_path, None, factory)
     
+    # Add a static mesh component to the blueprint
+    if new_blueprint is not None:
+        mesh_component = unreal.EditorStaticMeshLibrary.add_static_mesh_component_to_blueprint(
+            new_blueprint,
+            sphere_mesh
+        )
+        
+        # Save the blueprint
+        unreal.EditorAssetLibrary.save_asset(blueprint_path)
+
+if new_blueprint is not None:
     # Print result
     print(f"Created blueprint: {blueprint_path}")
     
@@ -53,4 +57,4 @@ else:
     }
 
 # This string will be captured by the MCP system
-str(result) 
\ No newline at end of file
+str(result)
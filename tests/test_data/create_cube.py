@@ -4,10 +4,10 @@ Test script to create a cube in Blender.
 
 import bpy
 
-# Clear existing objects
-bpy.ops.object.select_all(action='DESELECT')
-bpy.ops.object.select_by_type(type='MESH')
-bpy.ops.object.delete()
+# Clear existing objects through the data API, avoiding an operator call
+# (and depsgraph update) per step
+for obj in [o for o in bpy.data.objects if o.type == 'MESH']:
+    bpy.data.objects.remove(obj, do_unlink=True)
 
 # Create a cube
 bpy.ops.mesh.primitive_cube_add(size=2, location=(0, 0, 0))
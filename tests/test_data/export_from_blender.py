@@ -3,6 +3,7 @@ Test script to export a model from Blender.
 """
 
 import bpy
+import bmesh
 import os
 import tempfile
 
@@ -10,18 +11,23 @@ import tempfile
 temp_dir = tempfile.gettempdir()
 export_path = os.path.join(temp_dir, "test_export.fbx")
 
-# Clear existing objects
-bpy.ops.object.select_all(action='DESELECT')
-bpy.ops.object.select_by_type(type='MESH')
-bpy.ops.object.delete()
+# Clear existing objects through the data API, avoiding an operator call
+# (and depsgraph update) per step
+for obj in [o for o in bpy.data.objects if o.type == 'MESH']:
+    bpy.data.objects.remove(obj, do_unlink=True)
 
-# Create a simple model (a UV sphere)
-bpy.ops.mesh.primitive_uv_sphere_add(radius=1, location=(0, 0, 0), segments=32, ring_count=16)
-sphere = bpy.context.active_object
-sphere.name = "ExportSphere"
+# Create a simple model (a UV sphere), built with bmesh and written to the mesh once
+mesh = bpy.data.meshes.new("ExportSphere")
+bm = bmesh.new()
+bmesh.ops.create_uvsphere(bm, u_segments=32, v_segments=16, radius=1.0)
+bm.to_mesh(mesh)
+bm.free()
+sphere = bpy.data.objects.new("ExportSphere", mesh)
+bpy.context.collection.objects.link(sphere)
 
 # Select the object for export
-bpy.ops.object.select_all(action='DESELECT')
+for obj in bpy.context.selected_objects:
+    obj.select_set(False)
 sphere.select_set(True)
 bpy.context.view_layer.objects.active = sphere
 
@@ -14,13 +14,24 @@ from src.unreal_blender_mcp.langchain_integration import LangchainManager
 class TestLangchainManager(unittest.TestCase):
     """Test the LangchainManager class."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build one manager, with a mock embeddings key, for the whole class."""
+        with patch.multiple(
+            'src.unreal_blender_mcp.langchain_integration',
+            OpenAIEmbeddings=MagicMock(return_value=MagicMock())
+        ):
+            cls.manager = LangchainManager(embeddings_key="fake_key")
+        cls.default_templates = dict(cls.manager.prompt_templates)
+    
     def setUp(self):
-        """Set up test fixtures."""
-        # Initialize with a mock embeddings key
-        with patch('os.environ.get', return_value=None):
-            with patch('src.unreal_blender_mcp.langchain_integration.OpenAIEmbeddings') as mock_embeddings:
-                mock_embeddings.return_value = MagicMock()
-                self.manager = LangchainManager(embeddings_key="fake_key")
+        """Give each test an empty memory, document store and conversation, and the default templates."""
+        self.manager.clear_memory()
+        self.manager.document_store.clear()
+        self.manager.conversation_memory.clear()
+        self.manager.prompt_templates.clear()
+        self.manager.prompt_templates.update(self.default_templates)
+        self.manager._render_cached.cache_clear()
     
     def test_memory_management(self):
         """Test basic memory management functionality."""
@@ -55,6 +66,20 @@ class TestLangchainManager(unittest.TestCase):
         result = self.manager.generate_prompt(template_id="non_existent")
         self.assertEqual(result, "")
     
+    def test_prompt_render_cache(self):
+        """Test that only unhashable values bypass the render cache."""
+        with patch.object(self.manager, '_render', wraps=self.manager._render) as mock_render:
+            # Unhashable values are formatted directly
+            result = self.manager.generate_prompt(template="Objects: {names}", names=["Cube", "Sphere"])
+            self.assertEqual(result, "Objects: ['Cube', 'Sphere']")
+            mock_render.assert_called_once()
+            mock_render.reset_mock()
+            
+            # A TypeError from formatting itself is raised once, not retried uncached
+            with self.assertRaises(TypeError):
+                self.manager.generate_prompt(template="{value:>5}", value=object())
+            mock_render.assert_not_called()
+    
     @patch('src.unreal_blender_mcp.langchain_integration.RecursiveCharacterTextSplitter')
     def test_document_processing(self, mock_splitter):
         """Test document processing functionality."""
@@ -7,35 +7,48 @@ including API endpoints, error handling, and message processing.
 
 import unittest
 from unittest.mock import patch, MagicMock, AsyncMock
+import asyncio
 import json
 from fastapi.testclient import TestClient
 
-from src.unreal_blender_mcp.server import app, Message, StreamRequest, generate_id
-from src.unreal_blender_mcp.blender_connection import BlenderConnection
+from src.unreal_blender_mcp import server
+from src.unreal_blender_mcp.server import app, Message, StreamRequest, generate_id, generate_connection_id
 from src.unreal_blender_mcp.unreal_connection import UnrealConnection
 from src.unreal_blender_mcp.langchain_integration import LangchainManager
 
 class TestMCPServer(unittest.TestCase):
     """Test the MCP server."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.client = TestClient(app)
-        
+    @classmethod
+    def setUpClass(cls):
+        """Set up the client and patches shared by every test."""
         # Patch connections and langchain manager
-        self.blender_patcher = patch('src.unreal_blender_mcp.server.blender_connection')
-        self.unreal_patcher = patch('src.unreal_blender_mcp.server.unreal_connection')
-        self.langchain_patcher = patch('src.unreal_blender_mcp.server.langchain_manager')
+        cls.blender_patcher = patch('src.unreal_blender_mcp.server.blender_connection')
+        cls.unreal_patcher = patch('src.unreal_blender_mcp.server.unreal_connection')
+        cls.langchain_patcher = patch('src.unreal_blender_mcp.server.langchain_manager')
         
-        self.mock_blender = self.blender_patcher.start()
-        self.mock_unreal = self.unreal_patcher.start()
-        self.mock_langchain = self.langchain_patcher.start()
+        cls.mock_blender = cls.blender_patcher.start()
+        cls.mock_unreal = cls.unreal_patcher.start()
+        cls.mock_langchain = cls.langchain_patcher.start()
+        
+        # Warm up against the patched connections so the first request and
+        # validation pay for route setup and validator construction, not a test
+        cls.client = TestClient(app)
+        cls.client.get("/")
+        Message.model_validate({"role": "user", "content": "x", "id": "y"})
     
-    def tearDown(self):
-        """Tear down test fixtures."""
-        self.blender_patcher.stop()
-        self.unreal_patcher.stop()
-        self.langchain_patcher.stop()
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down the shared patches."""
+        cls.blender_patcher.stop()
+        cls.unreal_patcher.stop()
+        cls.langchain_patcher.stop()
+    
+    def setUp(self):
+        """Give each test fresh call history on the shared mocks."""
+        self.mock_blender.reset_mock()
+        self.mock_unreal.reset_mock()
+        self.mock_langchain.reset_mock()
     
     def test_root_endpoint(self):
         """Test the root endpoint."""
@@ -44,29 +57,29 @@ class TestMCPServer(unittest.TestCase):
         
         data = response.json()
         self.assertEqual(data["status"], "success")
-        self.assertIn("server", data["data"])
-        self.assertIn("version", data["data"])
-        self.assertIn("status", data["data"])
-        self.assertIn("endpoints", data["data"])
-    
-    @patch('src.unreal_blender_mcp.server.BlenderConnection.connect')
-    @patch('src.unreal_blender_mcp.server.UnrealConnection.connect')
-    def test_status_endpoint(self, mock_unreal_connect, mock_blender_connect):
+        self.assertEqual(data["data"]["status"], "running")
+        self.assertIn("name", data["data"])
+        self.assertIn("blender", data["data"]["connections"])
+        self.assertIn("unreal", data["data"]["connections"])
+        self.assertIn("active_streams", data["data"])
+    
+    @patch.dict('src.unreal_blender_mcp.server._status_probe', {"checked_at": None, "result": None})
+    def test_status_endpoint(self):
         """Test the status endpoint."""
-        # Mock connections
-        mock_blender_connect.return_value = AsyncMock(return_value=True)
-        mock_unreal_connect.return_value = AsyncMock(return_value=False)
+        # Blender is connected; Unreal is not, so /status tries to reconnect it
+        self.mock_blender.extended_features_enabled = True
+        self.mock_unreal.is_connected = False
         
         response = self.client.get("/status")
         self.assertEqual(response.status_code, 200)
         
         data = response.json()
         self.assertEqual(data["status"], "success")
-        self.assertIn("server", data["data"])
-        self.assertIn("active_connections", data["data"])
-        self.assertIn("blender", data["data"])
-        self.assertIn("unreal", data["data"])
-        self.assertIn("langchain", data["data"])
+        self.assertEqual(data["data"]["server"]["status"], "running")
+        self.assertIn("active_streams", data["data"])
+        self.assertEqual(data["data"]["connections"]["blender"], {"connected": True})
+        self.assertTrue(data["data"]["connections"]["unreal"]["connected"])
+        self.mock_unreal.connect.assert_called_once()
     
     def test_generate_id(self):
         """Test the generate_id function."""
@@ -79,6 +92,24 @@ class TestMCPServer(unittest.TestCase):
         # IDs should be strings
         self.assertIsInstance(id1, str)
         self.assertIsInstance(id2, str)
+        
+        # Message IDs come from a counter, so they are short and sequential
+        self.assertEqual(int(id2[1:], 16), int(id1[1:], 16) + 1)
+    
+    def test_generate_connection_id(self):
+        """Test the generate_connection_id function."""
+        id1 = generate_connection_id()
+        id2 = generate_connection_id()
+        
+        # IDs should be unique, unguessable hex tokens
+        self.assertNotEqual(id1, id2)
+        self.assertEqual(len(id1), 32)
+        int(id1, 16)
+        
+        # They come from the secrets module, not the message ID counter
+        with patch('src.unreal_blender_mcp.server.secrets.token_hex', return_value="ab" * 16) as mock_token_hex:
+            self.assertEqual(generate_connection_id(), "ab" * 16)
+        mock_token_hex.assert_called_once_with(16)
     
     @patch('src.unreal_blender_mcp.server.process_message')
     def test_message_endpoint(self, mock_process_message):
@@ -92,6 +123,7 @@ class TestMCPServer(unittest.TestCase):
         # Test with valid message
         response = self.client.post(
             "/message",
+            params={"stream": "false"},
             json={"role": "user", "content": "Hello", "id": "123"}
         )
         
@@ -100,6 +132,25 @@ class TestMCPServer(unittest.TestCase):
         self.assertEqual(data["status"], "success")
         self.assertIn("results", data["data"])
     
+    @patch('src.unreal_blender_mcp.server.process_message')
+    def test_message_endpoint_streaming(self, mock_process_message):
+        """Test that the message endpoint streams NDJSON results by default."""
+        async def mock_process():
+            yield {"event": "tool_result", "data": json.dumps({"id": "1"})}
+            yield {"event": "tool_result", "data": json.dumps({"id": "2"})}
+        
+        mock_process_message.return_value = mock_process()
+        
+        response = self.client.post(
+            "/message",
+            json={"role": "user", "content": "Hello", "id": "123"}
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual([line["event"] for line in lines], ["tool_result", "tool_result"])
+    
     def test_validation_error(self):
         """Test validation error handling."""
         # Send invalid message (missing required field)
@@ -114,6 +165,202 @@ class TestMCPServer(unittest.TestCase):
         self.assertEqual(data["code"], 422)
         self.assertEqual(data["message"], "Validation error")
         self.assertIn("errors", data["details"])
+        self.assertEqual(data["details"]["errors"][0]["loc"], ["body", "content"])
+    
+    def test_message_schema_documented(self):
+        """Test that the Message request body appears in the OpenAPI schema."""
+        paths = self.client.get("/openapi.json").json()["paths"]
+        for path in ("/message", "/stream/send"):
+            schema = paths[path]["post"]["requestBody"]["content"]["application/json"]["schema"]
+            self.assertEqual(schema["title"], "Message")
+            self.assertEqual(schema["required"], ["role", "content"])
+    
+    def test_backend_limits_per_event_loop(self):
+        """Test that backend limits made at startup work across separate server runs."""
+        async def contend():
+            # What startup_event does for each run
+            app.state.backend_semaphores = server._create_backend_semaphores()
+            limit = server._backend_limit("execute_blender_code")
+            self.assertIs(limit, server._backend_limit("mcp_blender_get_scene_info"))
+            
+            async def hold():
+                async with limit:
+                    await asyncio.sleep(0)
+            
+            # One more caller than the limit, so some of them have to wait
+            await asyncio.gather(*(hold() for _ in range(server.BLENDER_MAX_CONCURRENCY + 1)))
+        
+        try:
+            asyncio.run(contend())
+            asyncio.run(contend())
+        finally:
+            app.state.backend_semaphores = None
+
+class TestToolResultCache(unittest.IsolatedAsyncioTestCase):
+    """Test the read-only tool result cache in handle_tool_call."""
+    
+    def setUp(self):
+        """Start each test with an empty cache and a stubbed tool dispatch."""
+        server._tool_result_cache.clear()
+        self.addCleanup(server._tool_result_cache.clear)
+        
+        dispatch_patcher = patch('src.unreal_blender_mcp.server._dispatch_tool_call', new_callable=AsyncMock)
+        self.mock_dispatch = dispatch_patcher.start()
+        self.addCleanup(dispatch_patcher.stop)
+        self.mock_dispatch.return_value = {"status": "success", "objects": ["Cube"]}
+    
+    async def test_cache_hit(self):
+        """Test that a repeated read-only call is served from the cache."""
+        first = await server.handle_tool_call("get_scene_info", {})
+        second = await server.handle_tool_call("get_scene_info", {})
+        
+        self.assertEqual(first, second)
+        self.mock_dispatch.assert_awaited_once()
+    
+    async def test_cache_returns_copies(self):
+        """Test that modifying a returned result does not change the cached one."""
+        first = await server.handle_tool_call("get_scene_info", {})
+        first["objects"].append("Changed")
+        
+        second = await server.handle_tool_call("get_scene_info", {})
+        second["objects"].append("Changed again")
+        
+        third = await server.handle_tool_call("get_scene_info", {})
+        self.assertEqual(third["objects"], ["Cube"])
+        self.mock_dispatch.assert_awaited_once()
+    
+    async def test_ttl_expiry(self):
+        """Test that results are fetched again once their TTL has passed."""
+        with patch('src.unreal_blender_mcp.server.time.monotonic') as mock_monotonic:
+            mock_monotonic.return_value = 100.0
+            await server.handle_tool_call("get_scene_info", {})
+            
+            mock_monotonic.return_value = 100.0 + server.READ_ONLY_TOOL_CACHE_TTL / 2
+            await server.handle_tool_call("get_scene_info", {})
+            self.assertEqual(self.mock_dispatch.await_count, 1)
+            
+            mock_monotonic.return_value = 100.0 + server.READ_ONLY_TOOL_CACHE_TTL
+            await server.handle_tool_call("get_scene_info", {})
+            self.assertEqual(self.mock_dispatch.await_count, 2)
+    
+    async def test_expired_entries_evicted(self):
+        """Test that storing a result drops expired entries and respects the size limit."""
+        with patch('src.unreal_blender_mcp.server.time.monotonic') as mock_monotonic:
+            mock_monotonic.return_value = 100.0
+            await server.handle_tool_call("get_object_info", {"name": "Cube"})
+            await server.handle_tool_call("get_object_info", {"name": "Sphere"})
+            
+            mock_monotonic.return_value = 100.0 + server.READ_ONLY_TOOL_CACHE_TTL
+            await server.handle_tool_call("get_object_info", {"name": "Cone"})
+            self.assertEqual(len(server._tool_result_cache), 1)
+            
+            with patch.object(server, 'READ_ONLY_TOOL_CACHE_MAXSIZE', 2):
+                for name in ("A", "B", "C"):
+                    await server.handle_tool_call("get_object_info", {"name": name})
+                self.assertEqual(len(server._tool_result_cache), 2)
+    
+    async def test_mutating_tool_invalidates(self):
+        """Test that a mutating tool empties the cache."""
+        await server.handle_tool_call("get_scene_info", {})
+        await server.handle_tool_call("create_object", {"type": "CUBE"})
+        await server.handle_tool_call("get_scene_info", {})
+        
+        self.assertEqual(self.mock_dispatch.await_count, 3)
+    
+    async def test_read_racing_mutation_not_cached(self):
+        """Test that a read overlapping a mutating call does not store its result."""
+        read_started = asyncio.Event()
+        release_read = asyncio.Event()
+        
+        async def dispatch(tool_name, tool_args):
+            if tool_name == "get_scene_info" and not release_read.is_set():
+                read_started.set()
+                await release_read.wait()
+            return {"status": "success", "objects": ["Cube"]}
+        
+        self.mock_dispatch.side_effect = dispatch
+        
+        read = asyncio.create_task(server.handle_tool_call("get_scene_info", {}))
+        await read_started.wait()
+        await server.handle_tool_call("create_object", {"type": "CUBE"})
+        release_read.set()
+        await read
+        
+        # The read may have seen the scene from before the mutation, so it is not cached
+        self.assertEqual(server._tool_result_cache, {})
+
+class TestMemoryWriter(unittest.IsolatedAsyncioTestCase):
+    """Test the batched Langchain memory writer."""
+    
+    async def asyncSetUp(self):
+        """Start a memory writer with its own queue and a mock Langchain manager."""
+        for name, value in (
+            ('langchain_manager', MagicMock()),
+            ('blender_connection', MagicMock()),
+            ('unreal_connection', MagicMock()),
+            ('MEMORY_FLUSH_BATCH', 3),
+            ('MEMORY_FLUSH_INTERVAL', 10.0),
+            ('_memory_queue', asyncio.Queue()),
+        ):
+            patcher = patch.object(server, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        self.mock_langchain = server.langchain_manager
+        self.writer = asyncio.create_task(server._memory_writer())
+        patcher = patch.object(server, '_memory_writer_task', self.writer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    async def asyncTearDown(self):
+        """Stop the writer if the test did not shut it down."""
+        self.writer.cancel()
+        try:
+            await self.writer
+        except asyncio.CancelledError:
+            pass
+    
+    def stored_batches(self):
+        """The batches passed to store_memories so far."""
+        return [call.args[0] for call in self.mock_langchain.store_memories.call_args_list]
+    
+    async def test_flush_on_batch_size(self):
+        """Test that a full batch is stored without waiting for the interval."""
+        for index in range(3):
+            server._store_message_memory(f"message_{index}", index)
+        
+        await asyncio.wait_for(self._until_stored(1), timeout=1)
+        self.assertEqual(self.stored_batches(), [[("message_0", 0), ("message_1", 1), ("message_2", 2)]])
+        self.mock_langchain.store_memory.assert_not_called()
+    
+    async def test_flush_on_interval(self):
+        """Test that a partial batch is stored once the flush interval has passed."""
+        with patch.object(server, 'MEMORY_FLUSH_INTERVAL', 0.05):
+            server._store_message_memory("message_0", 0)
+            await asyncio.sleep(0)
+            self.assertEqual(self.stored_batches(), [])
+            
+            await asyncio.wait_for(self._until_stored(1), timeout=1)
+        self.assertEqual(self.stored_batches(), [[("message_0", 0)]])
+    
+    async def test_shutdown_flushes_pending_messages(self):
+        """Test that shutdown stores the batch the writer was still collecting."""
+        server._store_message_memory("message_0", 0)
+        # Let the writer pick up the first message and start collecting a batch
+        await asyncio.sleep(0)
+        server._store_message_memory("message_1", 1)
+        
+        await asyncio.wait_for(server.shutdown_event(), timeout=5)
+        
+        self.assertEqual(self.stored_batches(), [[("message_0", 0), ("message_1", 1)]])
+        self.assertTrue(self.writer.done())
+        self.assertIsNone(server._memory_queue)
+        self.assertIsNone(server._memory_writer_task)
+    
+    async def _until_stored(self, batches: int) -> None:
+        """Wait until store_memories has been called the given number of times."""
+        while self.mock_langchain.store_memories.call_count < batches:
+            await asyncio.sleep(0.01)
 
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
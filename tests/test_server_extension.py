@@ -0,0 +1,124 @@
+"""
+Tests for the extended server interface.
+
+This module contains tests for the ways ServerExtensionManager launches the
+extended BlenderMCP server.
+"""
+
+import socket
+import time
+import unittest
+import urllib.request
+from unittest.mock import patch, MagicMock
+
+from src.unreal_blender_mcp.blender_addon_server import extended_server
+from src.unreal_blender_mcp.blender_addon_server.interface import ServerExtensionManager, ServerExtensionPool
+
+def _free_port() -> int:
+    """Find a local port nothing is listening on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _accepts_connections(port: int) -> bool:
+    """Whether something is listening on the local port."""
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+def _wait_until(predicate, timeout: float = 30.0) -> bool:
+    """Poll predicate until it is true or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+class TestServerExtensionManager(unittest.TestCase):
+    """Test the ServerExtensionManager class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.manager = ServerExtensionManager()
+    
+    def test_run_server_inprocess(self):
+        """Test starting and stopping the extended server on a thread."""
+        port = _free_port()
+        handle = self.manager.run_server_inprocess(host="127.0.0.1", port=port, logging_level="WARNING")
+        self.addCleanup(handle.stop)
+        
+        self.assertTrue(_wait_until(lambda: handle.server.started, timeout=10))
+        self.assertTrue(handle.is_running)
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/openapi.json", timeout=5) as response:
+            self.assertEqual(response.status, 200)
+        
+        handle.stop()
+        self.assertFalse(handle.is_running)
+    
+    @patch.object(extended_server, '_extended_blender_connection', None)
+    def test_run_server_inprocess_closes_own_connection(self):
+        """Test that a Blender connection opened while the server ran is closed with it."""
+        handle = self.manager.run_server_inprocess(host="127.0.0.1", port=_free_port(), logging_level="WARNING")
+        self.addCleanup(handle.stop)
+        self.assertTrue(_wait_until(lambda: handle.server.started, timeout=10))
+        
+        # What the first Blender tool call does
+        connection = MagicMock()
+        extended_server._extended_blender_connection = connection
+        
+        handle.stop()
+        connection.disconnect.assert_called_once()
+        self.assertIsNone(extended_server._extended_blender_connection)
+    
+    def test_run_server_inprocess_keeps_shared_connection(self):
+        """Test that a Blender connection opened before the server started is left open."""
+        connection = MagicMock()
+        with patch.object(extended_server, '_extended_blender_connection', connection):
+            handle = self.manager.run_server_inprocess(host="127.0.0.1", port=_free_port(), logging_level="WARNING")
+            self.addCleanup(handle.stop)
+            self.assertTrue(_wait_until(lambda: handle.server.started, timeout=10))
+            
+            handle.stop()
+            connection.disconnect.assert_not_called()
+            self.assertIs(extended_server._extended_blender_connection, connection)
+
+class TestServerExtensionPool(unittest.TestCase):
+    """Test the ServerExtensionPool class."""
+    
+    def _run_and_shut_down(self, pool: ServerExtensionPool) -> None:
+        """Launch a server from the pool, check it serves, then stop it and the pool."""
+        port = _free_port()
+        process = pool.run_server(host="127.0.0.1", port=port, logging_level="WARNING")
+        self.addCleanup(process.kill)
+        
+        self.assertTrue(_wait_until(lambda: _accepts_connections(port)))
+        
+        process.terminate()
+        process.join(10)
+        self.assertFalse(process.is_alive())
+        pool.close()
+    
+    def test_run_server(self):
+        """Test launching and shutting down a server with the default start method."""
+        pool = ServerExtensionPool()
+        self.addCleanup(pool.close)
+        self._run_and_shut_down(pool)
+    
+    def test_run_server_standby_worker(self):
+        """Test the spawned standby worker used where forkserver is unavailable."""
+        with patch('multiprocessing.get_all_start_methods', return_value=["spawn"]):
+            pool = ServerExtensionPool()
+        self.addCleanup(pool.close)
+        self.assertFalse(pool.uses_forkserver)
+        
+        # Launching hands the warm worker over and spawns the next standby
+        first_standby = pool._standby[0]
+        self._run_and_shut_down(pool)
+        self.assertIsNone(pool._standby)
+        self.assertFalse(first_standby.is_alive())
+
+if __name__ == "__main__":
+    unittest.main()
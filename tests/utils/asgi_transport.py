@@ -0,0 +1,122 @@
+"""
+Streaming ASGI transport for httpx.
+
+httpx.ASGITransport collects the whole response body before returning, so an
+endless response such as the server's SSE stream never completes through it.
+This transport hands the response back as soon as the app starts it and feeds
+the body chunks through as the app sends them, all on the caller's event loop.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict
+
+import httpx
+
+# How long a closed stream gives the app to finish after the client disconnects
+DISCONNECT_TIMEOUT = 5.0
+
+
+class _ASGIResponseStream(httpx.AsyncByteStream):
+    """Response body fed from the chunks the app sends."""
+    
+    def __init__(self, chunks: asyncio.Queue, disconnected: asyncio.Event, app_task: asyncio.Task):
+        self._chunks = chunks
+        self._disconnected = disconnected
+        self._app_task = app_task
+    
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        while (chunk := await self._chunks.get()) is not None:
+            yield chunk
+    
+    async def aclose(self) -> None:
+        """Tell the app the client went away and wait for it to wind down."""
+        self._disconnected.set()
+        try:
+            await asyncio.wait_for(self._app_task, DISCONNECT_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+        except Exception:
+            # The request already failed or was answered; nothing left to report
+            pass
+
+
+class StreamingASGITransport(httpx.AsyncBaseTransport):
+    """
+    Serve httpx requests from an ASGI app, streaming the response body.
+    
+    Use with httpx.AsyncClient(transport=StreamingASGITransport(app), base_url=...).
+    """
+    
+    def __init__(self, app: Any, client: tuple = ("127.0.0.1", 123)):
+        """
+        Initialize the transport.
+        
+        Args:
+            app: The ASGI application to send requests to
+            client: (host, port) reported to the app as the client address
+        """
+        self.app = app
+        self.client = client
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Run the app for one request and return once the response has started."""
+        body = b"".join([chunk async for chunk in request.stream])
+        scope: Dict[str, Any] = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": request.method,
+            "headers": [(key.lower(), value) for key, value in request.headers.raw],
+            "scheme": request.url.scheme,
+            "path": request.url.path,
+            "raw_path": request.url.raw_path.split(b"?")[0],
+            "query_string": request.url.query,
+            "server": (request.url.host, request.url.port),
+            "client": self.client,
+            "root_path": "",
+        }
+        
+        started: asyncio.Future = asyncio.get_running_loop().create_future()
+        chunks: asyncio.Queue = asyncio.Queue()
+        disconnected = asyncio.Event()
+        request_sent = False
+        
+        async def receive() -> Dict[str, Any]:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+        
+        async def send(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                started.set_result(message)
+            elif message["type"] == "http.response.body":
+                if message.get("body"):
+                    chunks.put_nowait(message["body"])
+                if not message.get("more_body", False):
+                    chunks.put_nowait(None)
+        
+        async def run_app() -> None:
+            try:
+                await self.app(scope, receive, send)
+            except Exception as e:
+                if not started.done():
+                    started.set_exception(e)
+            finally:
+                # End the body for readers even if the app stopped without saying so
+                chunks.put_nowait(None)
+        
+        app_task = asyncio.create_task(run_app())
+        await asyncio.wait({started, app_task}, return_when=asyncio.FIRST_COMPLETED)
+        if not started.done():
+            raise RuntimeError("ASGI app returned without starting a response")
+        
+        message = started.result()
+        return httpx.Response(
+            message["status"],
+            headers=message.get("headers", []),
+            stream=_ASGIResponseStream(chunks, disconnected, app_task),
+            request=request,
+        )
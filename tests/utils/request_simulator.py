@@ -5,12 +5,22 @@ This module provides utilities for simulating AI agent requests to the MCP serve
 allowing for automated testing of server responses and behavior.
 """
 
-import json
+import re
+import orjson
 import asyncio
 import aiohttp
 import uuid
+from collections import deque
 from typing import Dict, List, Any, Optional, AsyncGenerator, Tuple
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Blank line terminating an SSE event
+_EVENT_BOUNDARY = re.compile(rb"\r?\n\r?\n")
+
+# Message/connection IDs kept ready by the refill task
+ID_POOL_SIZE = 1024
+
 
 class RequestSimulator:
     """
@@ -20,28 +30,64 @@ class RequestSimulator:
     that an AI agent would make to the MCP server.
     """
     
-    def __init__(self, base_url: str = "http://localhost:8300"):
+    def __init__(self, base_url: str = "http://localhost:8300", client: Optional[Any] = None):
         """
         Initialize the request simulator.
         
         Args:
             base_url: Base URL of the MCP server
+            client: Optional httpx.AsyncClient to send the requests with, e.g. one
+                bound to the app through tests.utils.asgi_transport so requests,
+                streams included, are served on the test's own event loop.
         """
         self.base_url = base_url
+        self.client = client
         self.session = None
         self.connection_id = None
+        self._stream_response = None
+        self._stream_events = None
         self.message_history = []
+        self._id_pool: deque[str] = deque()
+        self._id_pool_low = asyncio.Event()
+        self._refill_task = None
     
     async def __aenter__(self):
         """Enter the async context manager."""
-        self.session = aiohttp.ClientSession()
+        if self.client is None:
+            self.session = aiohttp.ClientSession()
+        self._id_pool_low.set()
+        self._refill_task = asyncio.create_task(self._refill_ids())
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Exit the async context manager."""
+        await self.close_stream()
+        if self._refill_task:
+            self._refill_task.cancel()
+            try:
+                await self._refill_task
+            except asyncio.CancelledError:
+                pass
+            self._refill_task = None
         if self.session:
             await self.session.close()
     
+    async def _refill_ids(self) -> None:
+        """Top the ID pool back up whenever it runs low."""
+        while True:
+            await self._id_pool_low.wait()
+            self._id_pool_low.clear()
+            while len(self._id_pool) < ID_POOL_SIZE:
+                self._id_pool.extend(uuid.uuid4().hex for _ in range(64))
+                # Let pending requests run between batches
+                await asyncio.sleep(0)
+    
+    def _next_id(self) -> str:
+        """Take a pregenerated ID, falling back to a fresh one if the pool is empty."""
+        if len(self._id_pool) < ID_POOL_SIZE // 2:
+            self._id_pool_low.set()
+        return self._id_pool.popleft() if self._id_pool else uuid.uuid4().hex
+    
     async def get_server_status(self) -> Dict[str, Any]:
         """
         Get the status of the MCP server.
@@ -49,8 +95,12 @@ class RequestSimulator:
         Returns:
             Server status information
         """
+        if self.client is not None:
+            response = await self.client.get("/status")
+            return orjson.loads(response.content)
+        
         async with self.session.get(f"{self.base_url}/status") as response:
-            return await response.json()
+            return await response.json(loads=orjson.loads)
     
     async def send_message(self, role: str, content: str, message_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -64,7 +114,7 @@ class RequestSimulator:
         Returns:
             Server response
         """
-        message_id = message_id or str(uuid.uuid4())
+        message_id = message_id or self._next_id()
         message = {
             "role": role,
             "content": content,
@@ -72,28 +122,56 @@ class RequestSimulator:
         }
         self.message_history.append(message)
         
+        if self.client is not None:
+            response = await self.client.post(
+                "/message", params={"stream": "false"}, content=orjson.dumps(message), headers=_JSON_HEADERS
+            )
+            return orjson.loads(response.content)
+        
         async with self.session.post(
             f"{self.base_url}/message", 
-            json=message
+            params={"stream": "false"},
+            data=orjson.dumps(message),
+            headers=_JSON_HEADERS
         ) as response:
-            return await response.json()
+            return await response.json(loads=orjson.loads)
     
-    async def connect_stream(self) -> Tuple[str, aiohttp.ClientResponse]:
+    async def connect_stream(self) -> Tuple[str, Any]:
         """
         Connect to the SSE stream.
         
+        The server assigns the connection ID and announces it in the stream's first
+        event, which is consumed here.
+        
         Returns:
-            Tuple of (connection_id, response)
+            Tuple of (connection_id, response); the response is an httpx.Response
+            when a client was injected, otherwise an aiohttp.ClientResponse
         """
-        connection_id = str(uuid.uuid4())
-        response = await self.session.get(
-            f"{self.base_url}/stream", 
-            params={"connection_id": connection_id}
-        )
-        self.connection_id = connection_id
-        return connection_id, response
+        if self.client is not None:
+            request = self.client.build_request("GET", "/sse")
+            response = await self.client.send(request, stream=True)
+        else:
+            response = await self.session.get(f"{self.base_url}/sse")
+        
+        self._stream_response = response
+        self._stream_events = self._parse_stream_events(response)
+        connected = await anext(self._stream_events)
+        self.connection_id = connected["connection_id"]
+        return self.connection_id, response
     
-    async def read_stream_events(self, response: aiohttp.ClientResponse) -> AsyncGenerator[Dict[str, Any], None]:
+    async def close_stream(self) -> None:
+        """Close the SSE stream opened by connect_stream."""
+        response, self._stream_response = self._stream_response, None
+        self._stream_events = None
+        self.connection_id = None
+        if response is None:
+            return
+        if self.client is not None:
+            await response.aclose()
+        else:
+            response.close()
+    
+    async def read_stream_events(self, response: Any) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Read events from an SSE stream.
         
@@ -103,17 +181,40 @@ class RequestSimulator:
         Yields:
             Parsed events from the stream
         """
-        async for line in response.content:
-            line = line.decode('utf-8').strip()
-            if line.startswith('data:'):
-                data = line[5:].strip()
+        if response is self._stream_response:
+            events = self._stream_events
+        else:
+            events = self._parse_stream_events(response)
+        async for event in events:
+            yield event
+    
+    async def _parse_stream_events(self, response: Any) -> AsyncGenerator[Dict[str, Any], None]:
+        """Parse the data of each SSE event as it arrives on the response."""
+        if self.client is not None:
+            chunks = response.aiter_bytes()
+        else:
+            chunks = response.content.iter_any()
+        
+        buffer = bytearray()
+        async for chunk in chunks:
+            buffer += chunk
+            # Events end with a blank line; servers may use \n or \r\n line endings
+            while (boundary := _EVENT_BOUNDARY.search(buffer)) is not None:
+                event = bytes(buffer[:boundary.start()])
+                del buffer[:boundary.end()]
+                
+                # Multi-line data fields are joined with newlines, per the SSE spec
+                data = b"\n".join(
+                    line[5:].removeprefix(b" ")
+                    for line in event.splitlines()
+                    if line.startswith(b"data:")
+                ).strip()
                 if data:
                     try:
-                        event_data = json.loads(data)
-                        yield event_data
-                    except json.JSONDecodeError:
+                        yield orjson.loads(data)
+                    except orjson.JSONDecodeError:
                         # Handle non-JSON data
-                        yield {"raw_data": data}
+                        yield {"raw_data": data.decode("utf-8", errors="replace")}
     
     async def send_stream_message(self, role: str, content: str, message_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -130,7 +231,7 @@ class RequestSimulator:
         if not self.connection_id:
             raise ValueError("Not connected to a stream. Call connect_stream() first.")
         
-        message_id = message_id or str(uuid.uuid4())
+        message_id = message_id or self._next_id()
         message = {
             "role": role,
             "content": content,
@@ -139,11 +240,22 @@ class RequestSimulator:
         }
         self.message_history.append(message)
         
+        if self.client is not None:
+            response = await self.client.post(
+                "/stream/send",
+                params={"connection_id": self.connection_id},
+                content=orjson.dumps(message),
+                headers=_JSON_HEADERS
+            )
+            return orjson.loads(response.content)
+        
         async with self.session.post(
             f"{self.base_url}/stream/send", 
-            json=message
+            params={"connection_id": self.connection_id},
+            data=orjson.dumps(message),
+            headers=_JSON_HEADERS
         ) as response:
-            return await response.json()
+            return await response.json(loads=orjson.loads)
     
     async def simulate_tool_call(self, tool_name: str, **parameters) -> Dict[str, Any]:
         """
@@ -157,24 +269,32 @@ class RequestSimulator:
             Server response
         """
         # Format the content to look like a tool call request from an AI agent
-        content = f"I want to call the {tool_name} tool with these parameters: {json.dumps(parameters)}"
+        content = f"I want to call the {tool_name} tool with these parameters: {orjson.dumps(parameters).decode()}"
         return await self.send_message("user", content)
     
-    async def simulate_conversation(self, messages: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    async def simulate_conversation(self, messages: List[Dict[str, str]], ordered: bool = False) -> List[Dict[str, Any]]:
         """
         Simulate a conversation with the server by sending multiple messages.
         
         Args:
             messages: List of messages to send, each with 'role' and 'content' keys
+            ordered: Wait for each response before sending the next message.
+                By default the messages are sent concurrently.
             
         Returns:
-            List of server responses
+            List of server responses, in the order of the messages
         """
-        responses = []
-        for message in messages:
-            response = await self.send_message(message["role"], message["content"])
-            responses.append(response)
-        return responses
+        if ordered:
+            responses = []
+            for message in messages:
+                response = await self.send_message(message["role"], message["content"])
+                responses.append(response)
+            return responses
+        
+        # gather starts the sends in order, so message_history keeps the input order
+        return list(await asyncio.gather(
+            *(self.send_message(message["role"], message["content"]) for message in messages)
+        ))
 
 
 class MockConnection:
@@ -196,7 +316,15 @@ class MockConnection:
         self.name = name
         self.expected_responses = expected_responses or {}
         self.call_history = []
+        self.calls_by_method: Dict[str, List[Dict[str, Any]]] = {}
         self.connected = False
+        
+        # Only keys mentioning execute_code are matched against code; collect them once
+        self._exec_patterns = [
+            (pattern, response)
+            for pattern, response in self.expected_responses.items()
+            if "execute_code" in pattern
+        ]
     
     async def connect(self) -> bool:
         """
@@ -206,13 +334,13 @@ class MockConnection:
             Success status
         """
         self.connected = True
-        self.call_history.append(("connect", {}))
+        self._record("connect", {})
         return self.expected_responses.get("connect", True)
     
     async def close(self) -> None:
         """Simulate closing the connection."""
         self.connected = False
-        self.call_history.append(("close", {}))
+        self._record("close", {})
     
     async def execute_code(self, code: str) -> Any:
         """
@@ -224,11 +352,12 @@ class MockConnection:
         Returns:
             Simulated execution result
         """
-        self.call_history.append(("execute_code", {"code": code}))
+        self._record("execute_code", {"code": code})
         
-        # Check if there's a specific response for this code
-        for pattern, response in self.expected_responses.items():
-            if pattern in code and "execute_code" in pattern:
+        # Check if there's a specific response for this code; the first
+        # matching pattern in insertion order wins
+        for pattern, response in self._exec_patterns:
+            if pattern in code:
                 return response
         
         # Default response
@@ -241,7 +370,7 @@ class MockConnection:
         Returns:
             Simulated scene information
         """
-        self.call_history.append(("get_scene_info", {}))
+        self._record("get_scene_info", {})
         return self.expected_responses.get("get_scene_info", {"objects": [], "materials": []})
     
     async def get_object_info(self, object_name: str) -> Dict[str, Any]:
@@ -254,12 +383,22 @@ class MockConnection:
         Returns:
             Simulated object information
         """
-        self.call_history.append(("get_object_info", {"object_name": object_name}))
+        self._record("get_object_info", {"object_name": object_name})
         return self.expected_responses.get(
             f"get_object_info_{object_name}", 
             {"name": object_name, "type": "MESH", "location": [0, 0, 0]}
         )
     
+    def _record(self, method: str, params: Dict[str, Any]) -> None:
+        """Record a call in the history and its per-method index."""
+        self.call_history.append((method, params))
+        self.calls_by_method.setdefault(method, []).append(params)
+    
+    @property
+    def last_call(self) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """The most recent (method_name, parameters) call, or None if there was none."""
+        return self.call_history[-1] if self.call_history else None
+    
     def get_call_history(self) -> List[Tuple[str, Dict[str, Any]]]:
         """
         Get the history of calls made to this mock connection.